@@ -1,7 +1,9 @@
 import logging
 import asyncio
 from aiohttp import web
-import json
+import hmac
+import orjson
+import msgpack
 import os
 import config
 
@@ -10,8 +12,49 @@ logger = logging.getLogger('NyxAPI')
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PALETTE_LAYOUT_FILE = os.path.join(BASE_DIR, "palette_layout.json")
 PRESETS_FILE = os.path.join(BASE_DIR, "presets.json")
+EMOJI_DB_FILE = os.path.join(BASE_DIR, "emoji_db.json")
+EMOJI_IMG_DIR = os.path.join(BASE_DIR, "emojis")
+EMOJI_EXTENSIONS = (".png", ".gif", ".jpg", ".jpeg", ".webp") # Lookup priority
+
+# Rapid successive saves of the same file are coalesced into one write
+SAVE_DEBOUNCE_SECONDS = 0.1
+
+# Format for files written to disk (readable, diff-friendly)
+PERSIST_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
+
+# Responses larger than this are gzipped for clients that accept it
+COMPRESS_THRESHOLD_BYTES = 1024
+
+# CORS Headers (shared by every response)
+CORS_HEADERS = (
+    ('Access-Control-Allow-Origin', '*'),
+    ('Access-Control-Allow-Methods', '*'),
+    ('Access-Control-Allow-Headers', '*'),
+)
 
 import memory_manager
+import helpers
+
+def ojson(data, status=200, headers=None):
+    """orjson-backed drop-in for web.json_response."""
+    return web.Response(body=orjson.dumps(data), status=status, content_type='application/json', headers=headers)
+
+def negotiated_response(request, data):
+    """MessagePack for clients that ask for it (NyxControl), JSON otherwise."""
+    if 'application/msgpack' in request.headers.get('Accept', ''):
+        return web.Response(body=msgpack.packb(data, use_bin_type=True), content_type='application/msgpack')
+    return ojson(data)
+
+DEFAULT_PALETTE_BYTES = orjson.dumps({"categories": {"Yami":[],"Calyptra":[],"Riven":[],"SΛTVRN":[],"Other":[]}, "hidden": [], "use_counts": {}})
+
+def _read_bytes(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+def _write_atomic(path, data):
+    """Writes bytes with helpers.atomic_write. Returns the new mtime."""
+    helpers.atomic_write(path, data, mode="wb")
+    return os.path.getmtime(path)
 
 class NyxAPI:
     def __init__(self, bot_client):
@@ -19,6 +62,10 @@ class NyxAPI:
         self.app = web.Application()
         self.port = config.CONTROL_API_PORT
         self.api_key = config.CONTROL_API_KEY
+
+        # Bot entry points, resolved once instead of hasattr() per request
+        self._state_actions = {name: getattr(bot_client, f'{name}_all_bars', None) for name in ('sleep', 'idle', 'awake')}
+        self._global_update = getattr(bot_client, 'global_update_bars', None)
         
         # Middleware / Auth
         self.app.middlewares.append(self.auth_middleware)
@@ -39,41 +86,73 @@ class NyxAPI:
         self.app.router.add_post('/api/presets', self.handle_save_presets)
         
         # Static Files
-        emojis_path = os.path.join(BASE_DIR, "emojis")
-        if os.path.exists(emojis_path):
-            self.app.router.add_static('/emojis', emojis_path)
+        if os.path.exists(EMOJI_IMG_DIR):
+            self.app.router.add_static('/emojis', EMOJI_IMG_DIR)
         
         self.runner = None
         self.site = None
 
-    async def auth_middleware(self, app, handler):
-        async def middleware_handler(request):
-            # CORS Headers
-            headers = {
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': '*',
-                'Access-Control-Allow-Headers': '*',
-            }
-
-            if request.method == 'OPTIONS':
-                return web.Response(headers=headers)
-
-            # Auth check
-            provided_key = request.headers.get('x-api-key')
-            if provided_key != self.api_key:
-                return web.json_response({'error': 'Unauthorized'}, status=401, headers=headers)
-
-            try:
-                response = await handler(request)
-                # Add CORS headers to response
-                for key, value in headers.items():
-                    response.headers[key] = value
-                return response
-            except Exception as e:
-                logger.error(f"Request Error: {e}")
-                return web.json_response({'error': str(e)}, status=500, headers=headers)
-                
-        return middleware_handler
+        # Serialized /api/emojis payload, rebuilt when emoji_db.json / emojis/
+        # change or Discord reports an emoji update
+        self._emoji_cache_bytes = None
+        self._emoji_cache_key = None
+        self._emoji_fragments = {} # emoji.id -> serialized JSON bytes
+
+        # Bar list for /api/bars, keyed on the (channel_id, message_id) pairs it was built from
+        self._bars_cache = []
+        self._bars_cache_key = None
+        self._bar_entries = {} # (channel_id, message_id) -> pre-stringified bar dict
+
+        # Persistence files held in memory as raw JSON bytes: path -> (bytes, mtime)
+        self._file_cache = {}
+
+        # Debounced persistence writes (path -> latest bytes / flush task)
+        self._pending_writes = {}
+        self._write_tasks = {}
+        self._write_lock = asyncio.Lock()
+
+        # Parsed emoji_db.json + file index shared by the emoji handlers
+        self._local_emojis = ({}, {})
+        self._local_emojis_key = None
+
+        # Emoji name -> filename index for emojis/, rebuilt when the dir changes
+        self._emoji_files = {}
+        self._emoji_files_mtime = None
+
+    @property
+    def api_key(self):
+        return self._api_key
+
+    @api_key.setter
+    def api_key(self, value):
+        # Encoded once here rather than on every request
+        self._api_key = value
+        self._api_key_bytes = str(value).encode()
+
+    @web.middleware
+    async def auth_middleware(self, request, handler):
+        if request.method == 'OPTIONS':
+            return web.Response(headers=CORS_HEADERS)
+
+        # Auth check (constant-time compare)
+        provided_key = request.headers.get('x-api-key')
+        if provided_key is None or not hmac.compare_digest(provided_key.encode(), self._api_key_bytes):
+            return ojson({'error': 'Unauthorized'}, status=401, headers=CORS_HEADERS)
+
+        try:
+            response = await handler(request)
+        except Exception as e:
+            logger.error(f"Request Error: {e}")
+            return ojson({'error': str(e)}, status=500, headers=CORS_HEADERS)
+
+        # Add CORS headers to response
+        response.headers.extend(CORS_HEADERS)
+
+        # Compress larger list payloads (emojis, bars, palette)
+        body = getattr(response, 'body', None)
+        if isinstance(body, bytes) and len(body) > COMPRESS_THRESHOLD_BYTES and 'gzip' in request.headers.get('Accept-Encoding', ''):
+            response.enable_compression(web.ContentCoding.gzip)
+        return response
 
     async def start(self):
         """Starts the web server."""
@@ -88,84 +167,179 @@ class NyxAPI:
         """Stops the web server."""
         if self.site:
             await self.runner.cleanup()
+        # Flush any debounced saves before shutdown
+        for task in list(self._write_tasks.values()):
+            await task
+
+    # --- File Helpers ---
+
+    async def _load_json_bytes(self, path, default):
+        """Returns the raw JSON bytes for path, re-reading only when the file changed on disk."""
+        if path in self._pending_writes:
+            return self._pending_writes[path]
+
+        mtime = self._get_mtime(path)
+        cached = self._file_cache.get(path)
+        if cached and cached[1] == mtime:
+            return cached[0]
+
+        body = await asyncio.to_thread(_read_bytes, path) if mtime else default
+        self._file_cache[path] = (body, mtime)
+        return body
+
+    def _schedule_write(self, path, body):
+        """Queues JSON bytes to be written to path; saves within SAVE_DEBOUNCE_SECONDS collapse into one write."""
+        self._pending_writes[path] = body
+        if path not in self._write_tasks:
+            self._write_tasks[path] = asyncio.create_task(self._flush_write(path))
+
+    async def _flush_write(self, path):
+        await asyncio.sleep(SAVE_DEBOUNCE_SECONDS)
+        del self._write_tasks[path] # Later saves schedule a fresh flush
+        body = self._pending_writes[path]
+        try:
+            async with self._write_lock:
+                mtime = await asyncio.to_thread(_write_atomic, path, body)
+            self._file_cache[path] = (body, mtime)
+        except Exception as e:
+            logger.error(f"Failed to save {os.path.basename(path)}: {e}")
+        finally:
+            if self._pending_writes.get(path) is body:
+                del self._pending_writes[path]
 
     # --- Handlers ---
 
     async def handle_status(self, request):
         """Returns bot health and status."""
-        return web.json_response({
+        return ojson({
             'status': 'online',
             'latency': round(self.bot.latency * 1000, 2),
             'user': str(self.bot.user),
             'id': self.bot.user.id
         })
 
-    async def handle_get_emojis(self, request):
-        """Returns a list of all custom emojis visible to the bot, filtered by Guild ID, merged with local storage."""
-        emojis_data = []
+    def invalidate_emoji_cache(self):
+        """Drops the cached /api/emojis payload (called on Discord emoji updates)."""
+        self._emoji_cache_bytes = None
+        self._emoji_fragments.clear()
+
+    @staticmethod
+    def _get_mtime(path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return 0.0
+
+    def _get_emoji_files(self):
+        """Returns {name: filename} for images in emojis/, re-listing only when the directory changes."""
+        dir_mtime = self._get_mtime(EMOJI_IMG_DIR)
+        if not dir_mtime:
+            return {}
+
+        if dir_mtime != self._emoji_files_mtime:
+            rank = {ext: i for i, ext in enumerate(EMOJI_EXTENSIONS)}
+            best = {}
+            for fname in os.listdir(EMOJI_IMG_DIR):
+                stem, ext = os.path.splitext(fname)
+                if ext in rank and (stem not in best or rank[ext] < best[stem][0]):
+                    best[stem] = (rank[ext], fname)
+            self._emoji_files = {stem: fname for stem, (_, fname) in best.items()}
+            self._emoji_files_mtime = dir_mtime
+        return self._emoji_files
+
+    def _temple_emojis(self):
+        """Emojis of the configured Temple Guild only (no walk over every guild's emojis)."""
+        guild = self.bot.get_guild(config.TEMPLE_GUILD_ID)
+        return guild.emojis if guild else ()
+
+    async def _load_local_emojis(self):
+        """Returns (local_map, emoji_files), re-reading only when emoji_db.json or emojis/ change."""
+        key = (self._get_mtime(EMOJI_DB_FILE), self._get_mtime(EMOJI_IMG_DIR))
+        if key != self._local_emojis_key:
+            local_map = orjson.loads(await self._load_json_bytes(EMOJI_DB_FILE, b"{}"))
+            emoji_files = await asyncio.to_thread(self._get_emoji_files)
+            self._local_emojis = (local_map, emoji_files)
+            self._local_emojis_key = key
+        return self._local_emojis
+
+    async def _iter_emoji_fragments(self):
+        """Yields each emoji as serialized JSON bytes: Temple Guild emojis first, then local-only ones."""
+        discord_names = set()
+        fragments = self._emoji_fragments
         
-        # 1. Fetch Discord Emojis
-        for emoji in self.bot.emojis:
-            # Filter: Only allow emojis from the configured Temple Guild
-            if emoji.guild.id != config.TEMPLE_GUILD_ID:
-                continue
-
-            # Format: <a:Name:ID> or <:Name:ID>
-            animated_tag = "a" if emoji.animated else ""
-            full_str = f"<{animated_tag}:{emoji.name}:{emoji.id}>"
-            
-            emojis_data.append({
-                "name": emoji.name,
-                "id": str(emoji.id),
-                "string": full_str,
-                "animated": emoji.animated,
-                "url": str(emoji.url),
-                "source": "discord"
-            })
+        # 1. Fetch Discord Emojis (serialized once per emoji id)
+        for emoji in self._temple_emojis():
+            discord_names.add(emoji.name)
+            frag = fragments.get(emoji.id)
+            if frag is None:
+                # Format: <a:Name:ID> or <:Name:ID>
+                animated_tag = "a" if emoji.animated else ""
+                full_str = f"<{animated_tag}:{emoji.name}:{emoji.id}>"
+                
+                frag = orjson.dumps({
+                    "name": emoji.name,
+                    "id": str(emoji.id),
+                    "string": full_str,
+                    "animated": emoji.animated,
+                    "url": str(emoji.url),
+                    "source": "discord"
+                })
+                fragments[emoji.id] = frag
+            yield frag
             
         # 2. Fetch Local Emojis (from emoji_db.json or filesystem)
-        local_db_path = os.path.join(BASE_DIR, "emoji_db.json")
-        if os.path.exists(local_db_path):
-            try:
-                with open(local_db_path, "r") as f:
-                    local_map = json.load(f)
-                    
-                # Get list of files in emojis/ dir to verify existence
-                emojis_dir = os.path.join(BASE_DIR, "emojis")
-                if os.path.exists(emojis_dir):
-                    local_files = os.listdir(emojis_dir)
+        try:
+            # Index of files in emojis/ dir to verify existence
+            local_map, emoji_files = await self._load_local_emojis()
+            if emoji_files:
+                for name, discord_str in local_map.items():
+                    # Check if we already have this name from Discord (Discord takes precedence for live URL)
+                    if name in discord_names:
+                        continue
+                        
+                    # Find matching file
+                    fname = emoji_files.get(name)
                     
-                    for name, discord_str in local_map.items():
-                        # Check if we already have this name from Discord (Discord takes precedence for live URL)
-                        if any(e['name'] == name for e in emojis_data):
-                            continue
-                            
-                        # Find matching file
-                        fname = None
-                        for ext in [".png", ".gif", ".jpg", ".jpeg", ".webp"]:
-                            if f"{name}{ext}" in local_files:
-                                fname = f"{name}{ext}"
-                                break
+                    if fname:
+                        # Construct URL to our static file server
+                        # Host needs to be relative or absolute. Relative is safest for proxy/LAN.
+                        # We can just return the filename and let frontend handle base URL
+                        # Or return a full path relative to API root
+                        url = f"/emojis/{fname}"
                         
-                        if fname:
-                            # Construct URL to our static file server
-                            # Host needs to be relative or absolute. Relative is safest for proxy/LAN.
-                            # We can just return the filename and let frontend handle base URL
-                            # Or return a full path relative to API root
-                            url = f"/emojis/{fname}"
-                            
-                            emojis_data.append({
-                                "name": name,
-                                "id": name, # Use name as ID for local
-                                "string": discord_str,
-                                "animated": fname.endswith(".gif"),
-                                "url": url,
-                                "source": "local"
-                            })
-            except Exception as e:
-                logger.error(f"Failed to load local emojis: {e}")
-            
-        return web.json_response({'emojis': emojis_data, 'count': len(emojis_data)})
+                        yield orjson.dumps({
+                            "name": name,
+                            "id": name, # Use name as ID for local
+                            "string": discord_str,
+                            "animated": fname.endswith(".gif"),
+                            "url": url,
+                            "source": "local"
+                        })
+        except Exception as e:
+            logger.error(f"Failed to load local emojis: {e}")
+
+    async def handle_get_emojis(self, request):
+        """Returns a list of all custom emojis visible to the bot, filtered by Guild ID, merged with local storage."""
+        # NDJSON: stream one emoji per line as it is produced
+        if 'application/x-ndjson' in request.headers.get('Accept', ''):
+            # Headers go out on prepare(), so CORS has to be set up front
+            resp = web.StreamResponse(headers=CORS_HEADERS)
+            resp.content_type = 'application/x-ndjson'
+            await resp.prepare(request)
+            async for frag in self._iter_emoji_fragments():
+                await resp.write(frag + b"\n")
+            await resp.write_eof()
+            return resp
+
+        # Serve cached payload unless emoji_db.json or emojis/ changed on disk
+        cache_key = (self._get_mtime(EMOJI_DB_FILE), self._get_mtime(EMOJI_IMG_DIR))
+        if self._emoji_cache_bytes is not None and cache_key == self._emoji_cache_key:
+            return web.Response(body=self._emoji_cache_bytes, content_type='application/json')
+
+        frags = [frag async for frag in self._iter_emoji_fragments()]
+        self._emoji_cache_bytes = b'{"emojis":[' + b','.join(frags) + b'],"count":' + str(len(frags)).encode() + b'}'
+        self._emoji_cache_key = cache_key
+        return web.Response(body=self._emoji_cache_bytes, content_type='application/json')
 
     async def handle_sync_emojis(self, request):
         """
@@ -174,55 +348,42 @@ class NyxAPI:
         """
         try:
             # 1. Get current palette
-            if os.path.exists(PALETTE_LAYOUT_FILE):
-                with open(PALETTE_LAYOUT_FILE, "r") as f:
-                    palette = json.load(f)
-            else:
-                palette = {"categories": {"Yami":[],"Calyptra":[],"Riven":[],"SΛTVRN":[],"Other":[]}, "hidden": [], "use_counts": {}}
+            palette = orjson.loads(await self._load_json_bytes(PALETTE_LAYOUT_FILE, DEFAULT_PALETTE_BYTES))
 
             # Flatten current palette to a set of names for fast lookup
             existing_names = set(palette["hidden"])
             for cat_list in palette["categories"].values():
                 existing_names.update(cat_list)
 
-            # 2. Get All Available Emojis (Reuse logic by calling internal helper if we refactored, 
-            # or just repeat simple fetch since we need names)
-            
-            # Fetch Discord Emojis
-            discord_names = []
-            for emoji in self.bot.emojis:
-                if emoji.guild.id != config.TEMPLE_GUILD_ID: continue
-                discord_names.append(emoji.name)
+            # 2. Get All Available Emojis (ordered, de-duplicated names)
+            available = dict.fromkeys(emoji.name for emoji in self._temple_emojis())
 
             # Fetch Local Emojis
-            local_db_path = os.path.join(BASE_DIR, "emoji_db.json")
-            if os.path.exists(local_db_path):
-                 with open(local_db_path, "r") as f:
-                    local_map = json.load(f)
-                    discord_names.extend(local_map.keys())
+            local_map, _ = await self._load_local_emojis()
+            available.update(dict.fromkeys(local_map))
 
             # 3. Add Missing to Hidden
-            added_count = 0
-            for name in discord_names:
-                if name not in existing_names:
-                    palette["hidden"].append(name)
-                    existing_names.add(name) # Prevent dups if local and discord match
-                    added_count += 1
+            new_names = [name for name in available if name not in existing_names]
+            palette["hidden"].extend(new_names)
+            added_count = len(new_names)
             
             # 4. Save
             if added_count > 0:
-                with open(PALETTE_LAYOUT_FILE, "w") as f:
-                    json.dump(palette, f, indent=4)
+                self._schedule_write(PALETTE_LAYOUT_FILE, orjson.dumps(palette, option=PERSIST_JSON_OPTIONS))
             
-            return web.json_response({'status': 'success', 'added': added_count})
+            return ojson({'status': 'success', 'added': added_count})
             
         except Exception as e:
             logger.error(f"Sync Error: {e}")
-            return web.json_response({'error': str(e)}, status=500)
+            return ojson({'error': str(e)}, status=500)
 
-    async def handle_get_bars(self, request):
-        """Returns a list of all active status bars."""
-        bars_data = []
+    def invalidate_bars_cache(self):
+        """Drops the cached bar list (called when channels are renamed/moved/deleted)."""
+        self._bars_cache_key = None
+        self._bar_entries = {}
+
+    async def _collect_bars(self):
+        """Returns (bars_data, global_content) for all active status bars."""
         global_content = ""
 
         # 1. Try to get Master Bar content directly from DB first (Source of Truth)
@@ -231,16 +392,40 @@ class NyxAPI:
         except:
             pass
 
-        # 2. Optimization: Using internal cache where possible to avoid API spam
-        for channel_id, message_id in self.bot.active_bars.items():
-            channel = self.bot.get_channel(channel_id)
-            if not channel:
-                continue
-            
-            category = channel.category.name if channel.category else "Uncategorized"
-            
-            # Fallback: Try to get content from cache to populate initial state if DB failed
-            if not global_content:
+        # 2. Bar list is rebuilt only when the set of bars/messages changes;
+        # entries (with their stringified IDs) are reused for bars that did not move
+        bars_key = tuple((cid, data.get("message_id")) for cid, data in self.bot.active_bars.items())
+        if bars_key != self._bars_cache_key:
+            old_entries = self._bar_entries
+            entries = {}
+            complete = True
+            for key in bars_key:
+                entry = old_entries.get(key)
+                if entry is None:
+                    channel_id, message_id = key
+                    channel = self.bot.get_channel(channel_id)
+                    if not channel:
+                        complete = False
+                        continue
+
+                    entry = {
+                        'channel_id': str(channel_id),
+                        'channel_name': channel.name,
+                        'category': channel.category.name if channel.category else "Uncategorized",
+                        'message_id': str(message_id)
+                    }
+                entries[key] = entry
+            self._bar_entries = entries
+            self._bars_cache = list(entries.values())
+            # An unresolved channel is looked up again next time instead of staying missing
+            self._bars_cache_key = bars_key if complete else None
+
+        # Fallback: Try to get content from cache to populate initial state if DB failed
+        if not global_content:
+            for channel_id, message_id in bars_key:
+                channel = self.bot.get_channel(channel_id)
+                if not channel:
+                    continue
                 try:
                     msg = self.bot.get_message(message_id)
                     if not msg:
@@ -251,17 +436,16 @@ class NyxAPI:
                     
                     if msg:
                         global_content = msg.content
+                        break
                 except:
                     pass
 
-            bars_data.append({
-                'channel_id': str(channel_id),
-                'channel_name': channel.name,
-                'category': category,
-                'message_id': str(message_id)
-            })
+        return self._bars_cache, global_content
 
-        return web.json_response({
+    async def handle_get_bars(self, request):
+        """Returns a list of all active status bars."""
+        bars_data, global_content = await self._collect_bars()
+        return negotiated_response(request, {
             'bars': bars_data, 
             'count': len(bars_data),
             'global_content': global_content
@@ -270,87 +454,73 @@ class NyxAPI:
     async def handle_global_update(self, request):
         """Updates the text content of ALL bars (Master Bar propagation)."""
         try:
-            data = await request.json()
+            data = orjson.loads(await request.read())
             new_content = data.get('content')
             
             if not new_content:
-                return web.json_response({'error': 'Missing content'}, status=400)
+                return ojson({'error': 'Missing content'}, status=400)
                 
             # Call the existing function in NyxOS.py
-            if hasattr(self.bot, 'global_update_bars'):
-                 await self.bot.global_update_bars(new_content)
-                 return web.json_response({'status': 'success', 'updated_content': new_content})
-            else:
-                 return web.json_response({'error': 'Bot function not found'}, status=500)
+            if self._global_update is None:
+                return ojson({'error': 'Bot function not found'}, status=500)
+            await self._global_update(new_content)
+            return ojson({'status': 'success', 'updated_content': new_content})
 
         except Exception as e:
             logger.error(f"API Error: {e}")
-            return web.json_response({'error': str(e)}, status=500)
+            return ojson({'error': str(e)}, status=500)
 
     async def handle_global_state(self, request):
         """Sleep/Idle/Awake all bars."""
         try:
-            data = await request.json()
+            data = orjson.loads(await request.read())
             action = data.get('action') # 'sleep', 'idle', 'awake'
             
-            if action == 'sleep':
-                if hasattr(self.bot, 'sleep_all_bars'):
-                    await self.bot.sleep_all_bars() 
-            elif action == 'idle':
-                if hasattr(self.bot, 'idle_all_bars'):
-                    await self.bot.idle_all_bars()
-            elif action == 'awake':
-                 if hasattr(self.bot, 'awake_all_bars'):
-                    await self.bot.awake_all_bars()
-            else:
-                return web.json_response({'error': 'Invalid action'}, status=400)
+            if action not in self._state_actions:
+                return ojson({'error': 'Invalid action'}, status=400)
+
+            fn = self._state_actions[action]
+            if fn is not None:
+                await fn()
                 
-            return web.json_response({'status': 'success', 'action': action})
+            return ojson({'status': 'success', 'action': action})
         except Exception as e:
             logger.error(f"API Error: {e}")
-            return web.json_response({'error': str(e)}, status=500)
+            return ojson({'error': str(e)}, status=500)
 
     async def handle_bar_update(self, request):
         """Updates a specific bar."""
         # To be implemented for granular control
-        return web.json_response({'status': 'not_implemented_yet'})
+        return ojson({'status': 'not_implemented_yet'})
 
     # --- Persistence Handlers ---
 
     async def handle_get_palette(self, request):
-        if os.path.exists(PALETTE_LAYOUT_FILE):
-            try:
-                with open(PALETTE_LAYOUT_FILE, "r") as f:
-                    data = json.load(f)
-                return web.json_response(data)
-            except Exception as e:
-                return web.json_response({'error': f"Failed to load palette: {e}"}, status=500)
-        return web.json_response({"categories": {"Yami":[],"Calyptra":[],"Riven":[],"SΛTVRN":[],"Other":[]}, "hidden": [], "use_counts": {}})
+        try:
+            body = await self._load_json_bytes(PALETTE_LAYOUT_FILE, DEFAULT_PALETTE_BYTES)
+        except Exception as e:
+            return ojson({'error': f"Failed to load palette: {e}"}, status=500)
+        return web.Response(body=body, content_type='application/json')
 
     async def handle_save_palette(self, request):
         try:
-            data = await request.json()
-            with open(PALETTE_LAYOUT_FILE, "w") as f:
-                json.dump(data, f, indent=4)
-            return web.json_response({'status': 'saved'})
+            data = orjson.loads(await request.read())
+            self._schedule_write(PALETTE_LAYOUT_FILE, orjson.dumps(data, option=PERSIST_JSON_OPTIONS))
+            return ojson({'status': 'saved'})
         except Exception as e:
-            return web.json_response({'error': str(e)}, status=500)
+            return ojson({'error': str(e)}, status=500)
 
     async def handle_get_presets(self, request):
-        if os.path.exists(PRESETS_FILE):
-            try:
-                with open(PRESETS_FILE, "r") as f:
-                    data = json.load(f)
-                return web.json_response(data)
-            except Exception as e:
-                return web.json_response({'error': f"Failed to load presets: {e}"}, status=500)
-        return web.json_response({})
+        try:
+            body = await self._load_json_bytes(PRESETS_FILE, b"{}")
+        except Exception as e:
+            return ojson({'error': f"Failed to load presets: {e}"}, status=500)
+        return web.Response(body=body, content_type='application/json')
 
     async def handle_save_presets(self, request):
         try:
-            data = await request.json()
-            with open(PRESETS_FILE, "w") as f:
-                json.dump(data, f, indent=4)
-            return web.json_response({'status': 'saved'})
+            data = orjson.loads(await request.read())
+            self._schedule_write(PRESETS_FILE, orjson.dumps(data, option=PERSIST_JSON_OPTIONS))
+            return ojson({'status': 'saved'})
         except Exception as e:
-            return web.json_response({'error': str(e)}, status=500)
+            return ojson({'error': str(e)}, status=500)
@@ -1,13 +1,16 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog, filedialog
+from tkinter import font as tkfont
 import threading
+import queue
 import time
-import json
 import os
 import sys
 import subprocess
 import re
-import copy
+import bisect
+import functools
+from concurrent.futures import ThreadPoolExecutor
 
 # Auto-install dependencies
 def install_and_import(package, import_name=None):
@@ -26,10 +29,16 @@ def install_and_import(package, import_name=None):
             sys.exit(1)
 
 install_and_import("requests")
+install_and_import("httpx")
+install_and_import("msgpack")
+install_and_import("orjson")
 install_and_import("Pillow", "PIL")
 
 import requests
-from PIL import Image, ImageTk, ImageSequence
+import httpx
+import msgpack
+import orjson
+from PIL import Image, ImageTk, ImageSequence, ImageDraw, ImageFont
 
 # ==========================================
 # CONFIGURATION & PATHS
@@ -37,40 +46,47 @@ from PIL import Image, ImageTk, ImageSequence
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 CONFIG_FILE = os.path.join(BASE_DIR, "nyxcontrolconfig.txt")
 EMOJI_DB_FILE = os.path.join(BASE_DIR, "emoji_db.json")
+EMOJI_LOG_FILE = os.path.join(BASE_DIR, "emoji_db.ndjson") # Imports appended since the last compaction
 PALETTE_LAYOUT_FILE = os.path.join(BASE_DIR, "palette_layout.json")
 PRESETS_FILE = os.path.join(BASE_DIR, "presets.json")
 EMOJI_IMG_DIR = os.path.join(BASE_DIR, "emojis")
+THUMB_DIR = os.path.join(EMOJI_IMG_DIR, "thumbs") # Pre-baked 32x32 PNGs of the above
+
+# Same on-disk format NyxAPI writes for these shared files
+PERSIST_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE
 
 # Ensure folders exist
-if not os.path.exists(EMOJI_IMG_DIR):
-    os.makedirs(EMOJI_IMG_DIR)
+if not os.path.exists(THUMB_DIR):
+    os.makedirs(THUMB_DIR)
 
 # Default Config
 API_URL = "http://localhost:5555"
 API_KEY = "changeme_default"
 
+def read_config_file(path):
+    """Parses KEY = value lines into a dict in one pass (comments and blanks skipped)."""
+    opts = {}
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line: continue
+            key, _, value = line.partition("=")
+            opts[key.strip()] = value.strip().strip('"').strip("'")
+    return opts
+
 def load_config():
     global API_URL, API_KEY
-    host = "localhost"
-    port = "5555"
+    opts = {}
     
     if os.path.exists(CONFIG_FILE):
         try:
-            with open(CONFIG_FILE, "r") as f:
-                content = f.read()
-                for line in content.splitlines():
-                    if "CONTROL_API_HOST" in line:
-                         try: host = line.split("=")[1].strip().strip('"').strip("'")
-                         except: pass
-                    if "CONTROL_API_PORT" in line:
-                        try: port = line.split("=")[1].strip()
-                        except: pass
-                    if "CONTROL_API_KEY" in line:
-                        try: API_KEY = line.split("=")[1].strip().strip('"').strip("'")
-                        except: pass
+            opts = read_config_file(CONFIG_FILE)
         except Exception as e:
             print(f"Error loading config: {e}")
-            
+    
+    host = opts.get("CONTROL_API_HOST", "localhost")
+    port = opts.get("CONTROL_API_PORT", "5555")
+    API_KEY = opts.get("CONTROL_API_KEY", API_KEY)
     API_URL = f"http://{host}:{port}"
 
 load_config()
@@ -79,10 +95,43 @@ load_config()
 emoji_map = {} # Name -> Discord String
 if os.path.exists(EMOJI_DB_FILE):
     try:
-        with open(EMOJI_DB_FILE, "r") as f:
-            emoji_map = json.load(f)
+        with open(EMOJI_DB_FILE, "rb") as f:
+            emoji_map = orjson.loads(f.read())
     except: pass
 
+# Replay imports that haven't been compacted into emoji_db.json yet
+if os.path.exists(EMOJI_LOG_FILE):
+    try:
+        with open(EMOJI_LOG_FILE, "rb") as f:
+            for line in f:
+                try: entry = orjson.loads(line)
+                except orjson.JSONDecodeError: continue # Torn final line from a crash
+                if entry.get("op") == "add": emoji_map[entry["name"]] = entry["code"]
+    except: pass
+
+# Preview tokenizer. Codes shaped like <:name:id> / <a:name:id> are matched by one generic
+# pattern and resolved through a dict, so scanning doesn't grow with the size of emoji_map
+# (re tries an alternation branch by branch). Only odd hand-entered codes are spelled out.
+DISCORD_EMOJI_PATTERN = r"<a?:\w+:\d+>"
+DISCORD_EMOJI_RE = re.compile(DISCORD_EMOJI_PATTERN)
+_code_index = None # (compiled pattern or None, code -> name); rebuilt after emoji_map changes
+
+def get_code_index():
+    """Matches may be Discord-shaped codes that aren't ours: check code_to_name.get()."""
+    global _code_index
+    if _code_index is None:
+        code_to_name = {}
+        for name, code in emoji_map.items():
+            code_to_name.setdefault(code, name)
+        odd = sorted((c for c in code_to_name if not DISCORD_EMOJI_RE.fullmatch(c)), key=len, reverse=True)
+        pattern = re.compile("|".join([*map(re.escape, odd), DISCORD_EMOJI_PATTERN])) if code_to_name else None
+        _code_index = (pattern, code_to_name)
+    return _code_index
+
+def invalidate_code_index():
+    global _code_index
+    _code_index = None
+
 # Load Palette Layout
 palette_layout = {
     "categories": {
@@ -98,8 +147,8 @@ palette_layout = {
 
 if os.path.exists(PALETTE_LAYOUT_FILE):
     try:
-        with open(PALETTE_LAYOUT_FILE, "r") as f:
-            loaded = json.load(f)
+        with open(PALETTE_LAYOUT_FILE, "rb") as f:
+            loaded = orjson.loads(f.read())
             # Migration: Old "quick" list -> "Other"
             if "quick" in loaded and isinstance(loaded["quick"], list):
                 palette_layout["categories"]["Other"].extend(loaded["quick"])
@@ -136,72 +185,256 @@ for cat in palette_layout["categories"]:
 presets = {}
 if os.path.exists(PRESETS_FILE):
     try:
-        with open(PRESETS_FILE, "r") as f:
-            presets = json.load(f)
+        with open(PRESETS_FILE, "rb") as f:
+            presets = orjson.loads(f.read())
     except: pass
 
-def save_presets():
+def write_file(path, data):
+    """Atomic + durable: write a tmp file, fsync it, then swap it over the target."""
+    # Per-thread tmp name: saves can come from the Tk thread and workers at once
+    tmp = f"{path}.{threading.get_ident()}.tmp"
     try:
-        with open(PRESETS_FILE, "w") as f:
-            json.dump(presets, f, indent=4)
-    except: pass
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return True
+    except Exception as e:
+        print(f"Error writing {path}: {e}")
+        try: os.remove(tmp)
+        except OSError: pass
+        return False
+
+# Debounced saves: a burst of calls (several drags, a sort) becomes one write
+SAVE_DEBOUNCE_SECONDS = 0.5
+EMOJI_COMPACT_SECONDS = 5.0
+_pending_saves = {} # key -> (threading.Timer, write fn)
+_pending_saves_lock = threading.Lock()
+
+def debounce_save(key, delay, fn):
+    """Runs fn once, delay seconds after the last call for this key."""
+    with _pending_saves_lock:
+        if key in _pending_saves: _pending_saves[key][0].cancel()
+        timer = threading.Timer(delay, _run_pending_save, args=(key,))
+        timer.daemon = True
+        _pending_saves[key] = (timer, fn)
+        timer.start()
+
+def _run_pending_save(key):
+    with _pending_saves_lock:
+        entry = _pending_saves.pop(key, None)
+    if entry: entry[1]()
+
+def flush_pending_saves():
+    """Runs every debounced save that hasn't fired yet (used on shutdown)."""
+    with _pending_saves_lock:
+        pending = list(_pending_saves.values())
+        _pending_saves.clear()
+    for timer, fn in pending:
+        timer.cancel()
+        fn()
+
+def save_presets():
+    debounce_save("presets", SAVE_DEBOUNCE_SECONDS, write_presets)
+
+def write_presets():
+    write_file(PRESETS_FILE, orjson.dumps(presets, option=PERSIST_JSON_OPTIONS))
 
 def save_palette_layout():
-    # Threaded save to prevent I/O lag
-    def _save(data):
+    debounce_save("palette", SAVE_DEBOUNCE_SECONDS, write_palette_layout)
+
+_last_palette_payload = None
+
+def write_palette_layout():
+    # The serialized bytes are the snapshot; identical ones (e.g. re-sorting a sorted list) skip the disk
+    global _last_palette_payload
+    payload = orjson.dumps(palette_layout, option=PERSIST_JSON_OPTIONS)
+    if payload == _last_palette_payload: return
+    if write_file(PALETTE_LAYOUT_FILE, payload):
+        _last_palette_payload = payload
+
+# emoji_db.json changes are appended to EMOJI_LOG_FILE (one line each) and compacted later
+_emoji_log_lock = threading.Lock()
+
+def record_emoji(name, code):
+    emoji_map[name] = code
+    line = orjson.dumps({"op": "add", "name": name, "code": code}, option=orjson.OPT_APPEND_NEWLINE)
+    with _emoji_log_lock:
         try:
-            with open(PALETTE_LAYOUT_FILE, "w") as f:
-                json.dump(data, f, indent=4)
+            with open(EMOJI_LOG_FILE, "ab") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
         except: pass
-    
-    data_copy = copy.deepcopy(palette_layout)
-    threading.Thread(target=_save, args=(data_copy,), daemon=True).start()
+    debounce_save("emoji_db", EMOJI_COMPACT_SECONDS, compact_emoji_db)
+
+def compact_emoji_db():
+    """Folds the append log into emoji_db.json (which NyxAPI reads) and drops the log."""
+    with _emoji_log_lock:
+        # The log is the only durable copy of recent imports until the rewrite lands
+        if not write_file(EMOJI_DB_FILE, orjson.dumps(emoji_map, option=PERSIST_JSON_OPTIONS)):
+            print(f"Emoji DB compaction failed; keeping {EMOJI_LOG_FILE}")
+            return
+        try: os.remove(EMOJI_LOG_FILE)
+        except OSError: pass
+
+if os.path.exists(EMOJI_LOG_FILE):
+    compact_emoji_db()
 
 save_palette_layout()
 
+# Palette geometry (pixels)
+PALETTE_CELL = 40
+PALETTE_HEADER_HEIGHT = 30
+PALETTE_ROW_BUFFER = 2 # Extra rows rendered above/below the viewport
+RESIZE_SETTLE_MS = 100 # Column re-flow waits until resizing pauses this long
+PALETTE_CATEGORY_ORDER = ["Yami", "Calyptra", "Riven", "SΛTVRN", "Other"]
+ICON_SIZE = (32, 32)
+SYNC_DOWNLOAD_WORKERS = 8 # Parallel icon downloads during a sync
+POLL_INTERVAL = 2.0 # Seconds between status polls
+PREVIEW_FRAME_MS = 16 # Keystrokes within one frame share one preview redraw
+
+# ==========================================
+# ICON FILES
+# ==========================================
+ICON_EXTENSIONS = [".png", ".gif", ".jpg", ".jpeg", ".webp"]
+ICON_FORMATS = ["PNG", "GIF", "JPEG", "WEBP"] # Only probe these Pillow plugins
+
+# Font for the text tiles of emojis that have no image file
+try: TILE_FONT = ImageFont.truetype("segoeui.ttf", 13)
+except OSError: TILE_FONT = ImageFont.load_default()
+
+_icon_paths = {}
+_icon_paths_mtime = None
+
+def get_icon_paths():
+    """{name: path} for emoji images, re-scanned only when the emojis/ directory changes."""
+    global _icon_paths, _icon_paths_mtime
+    try: dir_mtime = os.stat(EMOJI_IMG_DIR).st_mtime_ns
+    except OSError: return {}
+    
+    if dir_mtime != _icon_paths_mtime:
+        rank = {ext: i for i, ext in enumerate(ICON_EXTENSIONS)}
+        best = {}
+        with os.scandir(EMOJI_IMG_DIR) as entries:
+            for entry in entries:
+                name, ext = os.path.splitext(entry.name)
+                ext = ext.lower()
+                if ext in rank and (name not in best or rank[ext] < best[name][0]):
+                    best[name] = (rank[ext], entry.path)
+        _icon_paths = {name: path for name, (_, path) in best.items()}
+        _icon_paths_mtime = dir_mtime
+    return _icon_paths
+
+def thumb_path(name):
+    return os.path.join(THUMB_DIR, name + ".png")
+
+def bake_thumbnail(src_path, dest_path):
+    """Downscales src to ICON_SIZE once and saves it, so later loads skip the resize."""
+    # Image.open already sits on frame 0; no is_animated/seek (that walks every GIF frame)
+    img = Image.open(src_path, formats=ICON_FORMATS)
+    img.draft("RGB", ICON_SIZE) # JPEG: let the decoder downscale (1/2..1/8) instead of decoding full size
+    if img.mode not in ("RGB", "RGBA"): img = img.convert("RGBA") # Palette/LA modes would resize poorly
+    # reducing_gap: cheap integer box-reduce first, LANCZOS only for the last ~2x
+    img = img.resize(ICON_SIZE, Image.Resampling.LANCZOS, reducing_gap=2.0).convert("RGBA")
+    # Per-thread tmp + replace: the startup bake and on-demand loads may race on one file
+    tmp = f"{dest_path}.{threading.get_ident()}.tmp"
+    img.save(tmp, "PNG", optimize=True)
+    os.replace(tmp, dest_path)
+    return img
+
+def load_thumbnail(name, src_path):
+    """Returns the 32x32 image for an emoji, baking the thumbnail if missing or stale."""
+    dest = thumb_path(name)
+    try:
+        if os.path.getmtime(dest) >= os.path.getmtime(src_path):
+            with Image.open(dest, formats=["PNG"]) as img:
+                img.load()
+                return img
+    except OSError: pass
+    return bake_thumbnail(src_path, dest)
+
+def bake_missing_thumbnails():
+    """One-time migration: thumbnail every emoji image that doesn't have one yet."""
+    for name, path in get_icon_paths().items():
+        if os.path.exists(thumb_path(name)): continue
+        try: bake_thumbnail(path, thumb_path(name))
+        except: pass
+
 # ==========================================
 # API CLIENT
 # ==========================================
+# Bar listings are requested as MessagePack (smaller + faster to parse than JSON)
+MSGPACK_ACCEPT = {"Accept": "application/msgpack"}
+JSON_CONTENT = {"Content-Type": "application/json"}
+
 class NyxClient:
     def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({"x-api-key": API_KEY})
+        # One long-lived pooled client; keep-alive avoids reconnecting on every poll
+        self.session = httpx.Client(
+            base_url=API_URL,
+            headers={"x-api-key": API_KEY},
+            timeout=2.0,
+            # Pool limits live on the transport (httpx ignores Client limits= once one is given)
+            transport=httpx.HTTPTransport(
+                limits=httpx.Limits(max_keepalive_connections=4, max_connections=8, keepalive_expiry=30.0),
+                retries=2, # Retries failed connects only
+            ),
+        )
+
+    @staticmethod
+    def _decode(resp):
+        if resp.headers.get("content-type", "").startswith("application/msgpack"):
+            return msgpack.unpackb(resp.content, raw=False)
+        return orjson.loads(resp.content)
+
+    def _post_json(self, path, data):
+        return self.session.post(path, content=orjson.dumps(data), headers=JSON_CONTENT)
 
     def get_status(self):
         try:
-            resp = self.session.get(f"{API_URL}/api/status", timeout=1)
+            resp = self.session.get("/api/status", timeout=1)
             resp.raise_for_status()
-            return resp.json()
+            return orjson.loads(resp.content)
         except Exception as e:
             return {"error": str(e)}
 
     def get_bars(self):
         try:
-            resp = self.session.get(f"{API_URL}/api/bars", timeout=2)
+            resp = self.session.get("/api/bars", headers=MSGPACK_ACCEPT)
             resp.raise_for_status()
-            return resp.json()
+            return self._decode(resp)
         except Exception:
             return None
 
     def set_global_state(self, action):
         try:
-            resp = self.session.post(f"{API_URL}/api/global/state", json={"action": action}, timeout=2)
-            return resp.json()
+            resp = self._post_json("/api/global/state", {"action": action})
+            return orjson.loads(resp.content)
         except Exception as e:
             return {"error": str(e)}
 
     def set_global_text(self, text):
         try:
-            resp = self.session.post(f"{API_URL}/api/global/update", json={"content": text}, timeout=2)
-            return resp.json()
+            resp = self._post_json("/api/global/update", {"content": text})
+            return orjson.loads(resp.content)
         except Exception as e:
             return {"error": str(e)}
 
+    def iter_emojis(self):
+        """Streams emojis as NDJSON, yielding each one as soon as it arrives."""
+        with self.session.stream("GET", "/api/emojis", headers={"Accept": "application/x-ndjson"}, timeout=5) as resp:
+            resp.raise_for_status()
+            for line in resp.iter_lines():
+                if line:
+                    yield orjson.loads(line)
+
     def get_emojis(self):
         try:
-            resp = self.session.get(f"{API_URL}/api/emojis", timeout=5)
+            resp = self.session.get("/api/emojis", timeout=5)
             resp.raise_for_status()
-            return resp.json()
+            return orjson.loads(resp.content)
         except Exception as e:
             return {"error": str(e)}
 
@@ -216,6 +449,7 @@ class DragManager:
         self.dragged_item = None
         self.source_category = None
         self.is_dragging = False
+        self.drop_rects = None # (hidden rect or None, quick rect), root coords, set when a drag starts
 
     def start_drag(self, event, item_name, category):
         self.dragged_item = item_name
@@ -227,6 +461,16 @@ class DragManager:
             # Threshold met, start dragging
             self.is_dragging = True
             self.app.config(cursor="fleur")
+            # Drop targets don't move mid-drag: measure them once here, not on release
+            self.drop_rects = (
+                self._root_rect(self.app.hidden_frame) if self.app.storage_visible else None,
+                self._root_rect(self.app.quick_canvas),
+            )
+
+    @staticmethod
+    def _root_rect(widget):
+        x, y = widget.winfo_rootx(), widget.winfo_rooty()
+        return (x, y, x + widget.winfo_width(), y + widget.winfo_height())
 
     def stop_drag(self, event):
         self.app.config(cursor="") # Reset cursor
@@ -242,27 +486,15 @@ class DragManager:
         
         target_category = None
         
+        hidden_rect, quick_rect = self.drop_rects
+        
         # Check Hidden Pane if visible
-        if self.app.storage_visible:
-            hx = self.app.hidden_frame.winfo_rootx()
-            hy = self.app.hidden_frame.winfo_rooty()
-            hw = self.app.hidden_frame.winfo_width()
-            hh = self.app.hidden_frame.winfo_height()
-            if hx <= x <= hx + hw and hy <= y <= hy + hh:
-                target_category = "hidden"
-
-        # Check Categories
-        if not target_category:
-            for cat, frame in self.app.category_frames.items():
-                fx = frame.winfo_rootx()
-                fy = frame.winfo_rooty()
-                fw = frame.winfo_width()
-                fh = frame.winfo_height()
-                
-                # Approximate hit test
-                if fx <= x <= fx + fw and fy <= y <= fy + fh:
-                    target_category = cat
-                    break
+        if hidden_rect and hidden_rect[0] <= x <= hidden_rect[2] and hidden_rect[1] <= y <= hidden_rect[3]:
+            target_category = "hidden"
+
+        # Check Categories (stacked sections of the virtual quick palette)
+        if not target_category and quick_rect[0] <= x <= quick_rect[2] and quick_rect[1] <= y <= quick_rect[3]:
+            target_category = self.app.category_at(self.app.quick_canvas.canvasy(y - quick_rect[1]))
         
         if target_category and target_category != self.source_category:
             self.move_item(self.dragged_item, self.source_category, target_category)
@@ -299,12 +531,50 @@ class NyxControlApp(tk.Tk):
 
         self.drag_manager = DragManager(self)
         self.icon_cache = {}
+        self.icon_sources = {} # name -> (path, mtime_ns) each cached icon was decoded from
+        
+        # Icons decode off the Tk thread; a placeholder is shown until they land
+        self.icon_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="icon")
+        self.icon_pending = set()
+        self.text_tiles = {} # label -> PhotoImage, see text_tile
+        self.icon_paths = get_icon_paths() # name -> image file, refreshed per layout and on sync/import
+        self.icon_placeholder = ImageTk.PhotoImage(Image.new("RGBA", ICON_SIZE, (35, 39, 42, 255)))
+        
+        # Global actions share two workers instead of a new thread per click (bounds in-flight requests too)
+        self.net_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="nyx-net")
+        # Keep-alive pool to the CDN, shared by the parallel icon downloads in sync_emojis
+        self.download_session = requests.Session()
+        self.download_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=SYNC_DOWNLOAD_WORKERS, pool_maxsize=SYNC_DOWNLOAD_WORKERS))
+        self.online_text = "Online"
+        self.shown_status = (None, None, None) # (status text, indicator color, ping text) last applied by update_ui
         
         # Layout State
         self.storage_visible = False
-        self.category_frames = {} # cat_name -> Frame widget
+        self.preview_after_id = None
+        self.preview_items = [] # (spec, x, canvas item id) from the last preview render
+        self.preview_codes = {} # canvas item id -> Discord code, for right-click removal
+        self.last_preview_text = ""
+        self.last_preview_index = None # get_code_index() result the preview was rendered with
+        self.presets_entries = [] # Rows currently in presets_listbox
+        # One shared Font for preview text; measure() is a Tk round trip, so memoize it
+        self.preview_font = tkfont.Font(family="Consolas", size=10)
+        self.measure_text = functools.lru_cache(maxsize=1024)(self.preview_font.measure)
+        # Quick palette sections stack vertically: their tops (canvas coords) are bisectable
+        self.category_tops = []
+        self.category_names = []
+        self.categories_bottom = 0
         self.cols_quick = 5
         self.cols_hidden = 3
+        
+        # Virtual palette model: only rows inside the viewport get widgets
+        self.palette_rows = {"quick": [], "hidden": []}      # (top_y, category, [names])
+        self.palette_row_tops = {"quick": [], "hidden": []}  # top_y of each row, for bisect
+        self.palette_pools = {"quick": [], "hidden": []}     # recycled (label, window_id)
+        self.render_pending = set() # palette types with an after_idle render queued
+        self.layout_pending = set() # ... and with an after_idle layout queued
+        # Part of each cell's slot; moves/sorts keep it, so unchanged cells aren't reconfigured
+        self.icon_generation = 0
+        self.resize_after_ids = {} # palette type -> pending _apply_resize
 
         # Styles
         style = ttk.Style()
@@ -361,7 +631,7 @@ class NyxControlApp(tk.Tk):
         
         self.text_entry = tk.Entry(self.input_wrapper, bg="#23272A", fg="white", insertbackground="white", font=("Consolas", 11))
         self.text_entry.pack(side=tk.LEFT, fill=tk.X, expand=True)
-        self.text_entry.bind("<KeyRelease>", self.update_preview) 
+        self.text_entry.bind("<KeyRelease>", self.schedule_preview) 
         self.text_entry.bind("<Return>", lambda e: self.send_text_update())
         
         self.btn_clear = ttk.Button(self.input_wrapper, text="✖", width=3, command=self.clear_text)
@@ -369,6 +639,7 @@ class NyxControlApp(tk.Tk):
         
         self.preview_canvas = tk.Canvas(self.editor_frame, bg="#23272A", height=40, highlightthickness=0)
         self.preview_canvas.pack(fill=tk.X, pady=2)
+        self.preview_canvas.tag_bind("removable", "<Button-3>", self.on_preview_right_click)
 
         self.btn_update = ttk.Button(self.editor_frame, text="Update Text Globally", command=self.send_text_update)
         self.btn_update.pack(anchor=tk.E, pady=5)
@@ -416,15 +687,13 @@ class NyxControlApp(tk.Tk):
         ttk.Button(self.quick_toolbar, text="Sync", command=self.start_sync_emojis, width=6).pack(side=tk.RIGHT, padx=2)
         ttk.Button(self.quick_toolbar, text="+ Import", command=self.import_emoji, width=8).pack(side=tk.RIGHT, padx=2)
 
-        # Scrollable Area for Categories
-        self.quick_canvas = tk.Canvas(self.quick_frame, bg="#2C2F33", highlightthickness=0)
+        # Scrollable Area for Categories (virtualized, see _render_visible)
+        self.quick_canvas = tk.Canvas(self.quick_frame, bg="#2C2F33", highlightthickness=0, yscrollincrement=PALETTE_CELL)
         self.quick_scrollbar = ttk.Scrollbar(self.quick_frame, orient="vertical", command=self.quick_canvas.yview)
-        self.quick_scrollable_frame = ttk.Frame(self.quick_canvas)
-        self.quick_window_id = self.quick_canvas.create_window((0, 0), window=self.quick_scrollable_frame, anchor="nw")
         
-        self.quick_scrollable_frame.bind("<Configure>", lambda e: self.quick_canvas.configure(scrollregion=self.quick_canvas.bbox("all")))
         self.quick_canvas.bind("<Configure>", lambda e: self.on_canvas_resize(e, "quick"))
-        self.quick_canvas.configure(yscrollcommand=self.quick_scrollbar.set)
+        self.quick_canvas.bind("<MouseWheel>", lambda e: self.on_palette_wheel(e, "quick"))
+        self.quick_canvas.configure(yscrollcommand=lambda first, last: self.on_palette_scroll("quick", first, last))
         
         self.quick_canvas.pack(side="left", fill="both", expand=True, padx=5, pady=5)
         self.quick_scrollbar.pack(side="right", fill="y", pady=5)
@@ -435,19 +704,27 @@ class NyxControlApp(tk.Tk):
         
         ttk.Label(self.hidden_frame, text="Storage / Hidden", style="Header.TLabel").pack(anchor=tk.W, padx=5)
         
-        self.hidden_canvas = tk.Canvas(self.hidden_frame, bg="#23272A", highlightthickness=0) 
+        self.hidden_canvas = tk.Canvas(self.hidden_frame, bg="#23272A", highlightthickness=0, yscrollincrement=PALETTE_CELL) 
         self.hidden_scrollbar = ttk.Scrollbar(self.hidden_frame, orient="vertical", command=self.hidden_canvas.yview)
-        self.hidden_scrollable_frame = ttk.Frame(self.hidden_canvas)
-        self.hidden_window_id = self.hidden_canvas.create_window((0, 0), window=self.hidden_scrollable_frame, anchor="nw")
         
-        self.hidden_scrollable_frame.bind("<Configure>", lambda e: self.hidden_canvas.configure(scrollregion=self.hidden_canvas.bbox("all")))
         self.hidden_canvas.bind("<Configure>", lambda e: self.on_canvas_resize(e, "hidden"))
-        self.hidden_canvas.configure(yscrollcommand=self.hidden_scrollbar.set)
+        self.hidden_canvas.bind("<MouseWheel>", lambda e: self.on_palette_wheel(e, "hidden"))
+        self.hidden_canvas.configure(yscrollcommand=lambda first, last: self.on_palette_scroll("hidden", first, last))
         
         self.hidden_canvas.pack(side="left", fill="both", expand=True, padx=5, pady=5)
         self.hidden_scrollbar.pack(side="right", fill="y", pady=5)
 
+        # Palette cells share class-level handlers that read the cell's current slot
+        self.bind_class("PaletteCell", "<Button-1>", self.on_cell_press)
+        self.bind_class("PaletteCell", "<B1-Motion>", self.drag_manager.on_motion)
+        self.bind_class("PaletteCell", "<ButtonRelease-1>", self.drag_manager.stop_drag)
+        self.bind_class("PaletteCell", "<Enter>", self.on_cell_enter)
+        self.bind_class("PaletteCell", "<Leave>", lambda e: self.status_label.config(text=self.online_text))
+        self.bind_class("PaletteCell", "<MouseWheel>", lambda e: self.on_palette_wheel(e, e.widget.palette_type))
+
         self.render_palettes()
+        # Queued behind the visible icons, so it never delays the first paint
+        self.icon_pool.submit(bake_missing_thumbnails)
         self.poll_api()
 
     def toggle_storage(self):
@@ -459,115 +736,245 @@ class NyxControlApp(tk.Tk):
             self.content_pane.add(self.hidden_frame, minsize=200)
             self.btn_storage.config(text="Hide Storage")
             self.storage_visible = True
+            self.schedule_render("hidden")
 
     def on_canvas_resize(self, event, palette_type):
-        canvas = self.quick_canvas if palette_type == "quick" else self.hidden_canvas
-        window_id = self.quick_window_id if palette_type == "quick" else self.hidden_window_id
-        canvas.itemconfig(window_id, width=event.width)
-
+        # Dragging a window edge fires a stream of <Configure>s: settle before re-flowing columns
+        pending = self.resize_after_ids.get(palette_type)
+        if pending: self.after_cancel(pending)
+        self.resize_after_ids[palette_type] = self.after(RESIZE_SETTLE_MS, self._apply_resize, palette_type, event.width)
+        # A taller/shorter viewport only needs its visible rows refreshed
+        self.schedule_render(palette_type)
+
+    def _apply_resize(self, palette_type, width):
+        self.resize_after_ids.pop(palette_type, None)
         # Calculate Columns
-        cell_width = 40
-        new_cols = max(1, event.width // cell_width)
-        
-        current_cols = getattr(self, f"cols_{palette_type}")
-        if abs(new_cols - current_cols) > 0:
-             setattr(self, f"cols_{palette_type}", new_cols)
-             self.render_palettes()
+        new_cols = max(1, width // PALETTE_CELL)
+        if new_cols != getattr(self, f"cols_{palette_type}"):
+            setattr(self, f"cols_{palette_type}", new_cols)
+            self.schedule_layout(palette_type)
+
+    def on_palette_scroll(self, palette_type, first, last):
+        scrollbar = self.quick_scrollbar if palette_type == "quick" else self.hidden_scrollbar
+        scrollbar.set(first, last)
+        self.schedule_render(palette_type)
+
+    def on_palette_wheel(self, event, palette_type):
+        canvas = self.quick_canvas if palette_type == "quick" else self.hidden_canvas
+        canvas.yview_scroll(int(-event.delta / 120), "units")
 
     # --- IMAGE HELPERS ---
     def load_icon(self, name):
         if name in self.icon_cache:
             return self.icon_cache[name]
+        if name in self.icon_pending:
+            return self.icon_placeholder
             
-        found_path = None
-        for ext in [".png", ".gif", ".jpg", ".jpeg", ".webp"]:
-            path = os.path.join(EMOJI_IMG_DIR, name + ext)
-            if os.path.exists(path):
-                found_path = path
-                break
+        found_path = self.icon_paths.get(name)
         if not found_path: return None
-            
+        
+        self.icon_pending.add(name)
+        self.icon_pool.submit(self._decode_icon, name, found_path)
+        return self.icon_placeholder
+
+    def _decode_icon(self, name, path):
+        # Worker thread: PIL work only, PhotoImage must be built on the Tk thread
         try:
-            img = Image.open(found_path)
-            if hasattr(img, 'is_animated') and img.is_animated: img.seek(0)
-            img = img.resize((32, 32), Image.Resampling.LANCZOS)
-            photo = ImageTk.PhotoImage(img)
-            self.icon_cache[name] = photo
-            return photo
-        except: return None
+            source = (path, os.stat(path).st_mtime_ns)
+            img = load_thumbnail(name, path)
+        except: source, img = (path, None), None
+        self.after(0, self._install_icon, name, img, source)
+
+    def _install_icon(self, name, img, source):
+        self.icon_pending.discard(name)
+        # Undecodable images are cached as None so they fall back to text
+        self.icon_cache[name] = ImageTk.PhotoImage(img) if img is not None else None
+        self.icon_sources[name] = source
+        icon = self.icon_cache[name]
+        
+        for pool in self.palette_pools.values():
+            for w, _ in pool:
+                if w.slot and w.slot[0] == name:
+                    w.configure(image=icon or self.text_tile(name[:2]))
+        
+        if name in emoji_map and emoji_map[name] in self.text_entry.get():
+            self.last_preview_text = None # Same text, new icon: force the re-render
+            self.update_preview()
 
-    def render_palettes(self):
-        # Clear Quick Frame
-        for w in self.quick_scrollable_frame.winfo_children(): w.destroy()
-        self.category_frames.clear()
-        
-        # Render Categories
-        order = ["Yami", "Calyptra", "Riven", "SΛTVRN", "Other"]
-        for cat in order:
-            if cat not in palette_layout["categories"]: continue
-            
-            # Header
-            lbl = ttk.Label(self.quick_scrollable_frame, text=cat, style="Category.TLabel")
-            lbl.pack(fill=tk.X, padx=5, pady=(10, 2))
-            
-            # Grid Frame
-            f = ttk.Frame(self.quick_scrollable_frame)
-            f.pack(fill=tk.X, padx=5)
-            self.category_frames[cat] = f
-            
-            self._render_grid(f, palette_layout["categories"][cat], cat, self.cols_quick)
+    def text_tile(self, label):
+        """Shared 32x32 image of a short label, for emojis without an image file (rendered once per label)."""
+        tile = self.text_tiles.get(label)
+        if tile is None:
+            img = Image.new("RGBA", ICON_SIZE, (0, 0, 0, 0))
+            draw = ImageDraw.Draw(img)
+            left, top, right, bottom = draw.textbbox((0, 0), label, font=TILE_FONT)
+            pos = ((ICON_SIZE[0] - (right - left)) / 2 - left, (ICON_SIZE[1] - (bottom - top)) / 2 - top)
+            draw.text(pos, label, font=TILE_FONT, fill="white")
+            tile = self.text_tiles[label] = ImageTk.PhotoImage(img)
+        return tile
 
-        # Render Hidden
-        for w in self.hidden_scrollable_frame.winfo_children(): w.destroy()
-        self._render_grid(self.hidden_scrollable_frame, palette_layout["hidden"], "hidden", self.cols_hidden)
+    def render_palettes(self):
+        self.schedule_layout("quick")
+        self.schedule_layout("hidden")
+
+    def refresh_icons(self):
+        """Image files changed (sync/import): recycled cells re-resolve their icons on the next render."""
+        self.icon_paths = get_icon_paths()
+        # Drop cached icons whose source file was replaced, moved or removed since it was decoded
+        for name, (path, mtime) in list(self.icon_sources.items()):
+            try: current = os.stat(path).st_mtime_ns
+            except OSError: current = None
+            if current != mtime or self.icon_paths.get(name) != path:
+                self.icon_cache.pop(name, None)
+                del self.icon_sources[name]
+        self.icon_generation += 1
+        self.render_palettes()
 
-    def _render_grid(self, parent, item_list, category, max_cols):
-        row = 0
-        col = 0
+    def schedule_layout(self, palette_type):
+        """Moves, sorts, syncs and resize steps in one tick share a single row-model rebuild."""
+        if palette_type in self.layout_pending: return
+        self.layout_pending.add(palette_type)
+        self.after_idle(self._layout_palette, palette_type)
+
+    def _layout_palette(self, palette_type):
+        """Rebuilds the row model for one palette; widgets are only assigned in _render_visible."""
+        self.layout_pending.discard(palette_type)
+        # Revalidate the icon index once per layout; load_icon then does plain dict lookups
+        self.icon_paths = get_icon_paths()
+        canvas = self.quick_canvas if palette_type == "quick" else self.hidden_canvas
+        max_cols = getattr(self, f"cols_{palette_type}")
+        canvas.delete("header")
         
-        bg_color = "#23272A" if category=="hidden" else "#2C2F33"
+        if palette_type == "quick":
+            self.category_tops = []
+            self.category_names = []
+            sections = [(cat, palette_layout["categories"][cat]) for cat in PALETTE_CATEGORY_ORDER if cat in palette_layout["categories"]]
+        else:
+            sections = [("hidden", palette_layout["hidden"])]
         
-        for name in item_list:
-            if name not in emoji_map: continue
-            
-            discord_str = emoji_map[name]
-            icon = self.load_icon(name)
-            
-            if icon:
-                w = tk.Label(parent, image=icon, bg=bg_color)
-            else:
-                disp = name[:2]
-                w = tk.Label(parent, text=disp, font=("Segoe UI", 10), bg=bg_color, fg="white", width=4)
-            
-            # Bindings
-            w.bind("<Button-1>", lambda e, c=discord_str, n=name, cat=category: self.on_emoji_click(e, c, n, cat))
-            w.bind("<B1-Motion>", self.drag_manager.on_motion)
-            w.bind("<ButtonRelease-1>", self.drag_manager.stop_drag)
-            w.bind("<Enter>", lambda e, n=name: self.status_label.config(text=f"Emoji: {n} (Uses: {palette_layout['use_counts'].get(name, 0)})"))
-            w.bind("<Leave>", lambda e: self.status_label.config(text="Online"))
+        rows = []
+        y = 0
+        for cat, item_list in sections:
+            top = y
+            if palette_type == "quick":
+                # Header
+                canvas.create_text(10, y + 18, text=cat, anchor="w", fill="#99AAB5", font=("Segoe UI", 11, "bold"), tags="header")
+                y += PALETTE_HEADER_HEIGHT
             
-            w.grid(row=row, column=col, padx=2, pady=2)
+            names = [name for name in item_list if name in emoji_map]
+            for i in range(0, len(names), max_cols):
+                rows.append((y, cat, names[i:i + max_cols]))
+                y += PALETTE_CELL
             
-            col += 1
-            if col >= max_cols:
-                col = 0
-                row += 1
+            if palette_type == "quick":
+                self.category_tops.append(top)
+                self.category_names.append(cat)
+        
+        if palette_type == "quick":
+            self.categories_bottom = y
+        self.palette_rows[palette_type] = rows
+        self.palette_row_tops[palette_type] = [row[0] for row in rows]
+        # Full height up front so the scrollbar reflects every row, rendered or not
+        canvas.configure(scrollregion=(0, 0, canvas.winfo_width(), y))
+        self.schedule_render(palette_type)
+
+    def category_at(self, y):
+        """Quick palette category under canvas y, or None."""
+        i = bisect.bisect_right(self.category_tops, y) - 1
+        if i < 0 or y >= self.categories_bottom: return None
+        return self.category_names[i]
+
+    def schedule_render(self, palette_type):
+        """Layout, scroll and resize all funnel here; they share one render per idle cycle."""
+        if palette_type in self.render_pending: return
+        self.render_pending.add(palette_type)
+        self.after_idle(self._render_visible, palette_type)
+
+    def _render_visible(self, palette_type):
+        self.render_pending.discard(palette_type)
+        # The storage pane isn't mapped while hidden; toggle_storage renders it on show
+        if palette_type == "hidden" and not self.storage_visible: return
+        
+        canvas = self.quick_canvas if palette_type == "quick" else self.hidden_canvas
+        rows = self.palette_rows[palette_type]
+        tops = self.palette_row_tops[palette_type]
+        pool = self.palette_pools[palette_type]
+        
+        view_top = canvas.canvasy(0)
+        view_bottom = view_top + canvas.winfo_height()
+        first = max(0, bisect.bisect_right(tops, view_top) - 1 - PALETTE_ROW_BUFFER)
+        last = bisect.bisect_left(tops, view_bottom) + PALETTE_ROW_BUFFER
+        
+        used = 0
+        for top, category, names in rows[first:last]:
+            for col, name in enumerate(names):
+                if used == len(pool):
+                    pool.append(self._make_palette_cell(canvas, palette_type))
+                w, window_id = pool[used]
+                used += 1
+                
+                slot = (name, category, 5 + col * PALETTE_CELL, top + 2, self.icon_generation)
+                if w.slot != slot:
+                    w.slot = slot
+                    icon = self.load_icon(name)
+                    w.configure(image=icon or self.text_tile(name[:2]))
+                    canvas.coords(window_id, slot[2], slot[3])
+                if not w.shown:
+                    canvas.itemconfigure(window_id, state="normal")
+                    w.shown = True
+        
+        # Park whatever the viewport doesn't need (cells already parked cost nothing)
+        for w, window_id in pool[used:]:
+            if w.shown:
+                canvas.itemconfigure(window_id, state="hidden")
+                w.shown = False
+
+    def _make_palette_cell(self, canvas, palette_type):
+        bg_color = "#23272A" if palette_type == "hidden" else "#2C2F33"
+        w = tk.Label(canvas, bg=bg_color)
+        w.slot = None # (name, category, x, y, icon generation) currently shown
+        w.shown = False # Mirrors the window item's state, so renders skip no-op itemconfigures
+        w.palette_type = palette_type
+        # Handlers are bound once on the PaletteCell class tag (see __init__)
+        w.bindtags(("PaletteCell",) + w.bindtags())
+        
+        window_id = canvas.create_window(0, 0, window=w, anchor="nw", width=PALETTE_CELL - 4, height=PALETTE_CELL - 4, state="hidden")
+        return w, window_id
     
     def sort_palettes(self, method):
+        # key= already computes each key once per item; keep the key itself free of lambdas/lookups
+        counts = palette_layout["use_counts"]
         def sort_list(lst):
             if method == "name":
-                lst.sort(key=lambda x: x.lower())
+                ordered = sorted(lst, key=str.lower)
             elif method == "usage":
-                lst.sort(key=lambda x: (-palette_layout["use_counts"].get(x, 0), x.lower()))
+                ordered = sorted(lst, key=lambda x, get=counts.get: (-get(x, 0), x.lower()))
+            else:
+                return False
+            if ordered == lst: return False
+            lst[:] = ordered
+            return True
         
         # Sort each category
+        changed = False
         for cat in palette_layout["categories"]:
-            sort_list(palette_layout["categories"][cat])
+            changed |= sort_list(palette_layout["categories"][cat])
             
-        sort_list(palette_layout["hidden"])
+        changed |= sort_list(palette_layout["hidden"])
+        if not changed: return # Already in order: no save, no relayout
         save_palette_layout()
         self.render_palettes()
 
+    def on_cell_press(self, event):
+        if not event.widget.slot: return
+        name, category = event.widget.slot[:2]
+        self.on_emoji_click(event, emoji_map.get(name, ""), name, category)
+
+    def on_cell_enter(self, event):
+        if not event.widget.slot: return
+        name = event.widget.slot[0]
+        self.status_label.config(text=f"Emoji: {name} (Uses: {palette_layout['use_counts'].get(name, 0)})")
+
     def on_emoji_click(self, event, code, name, category):
         self.drag_manager.start_drag(event, name, category)
         if not self.drag_manager.is_dragging:
@@ -580,47 +987,60 @@ class NyxControlApp(tk.Tk):
         threading.Thread(target=self.sync_emojis, daemon=True).start()
 
     def sync_emojis(self):
-        resp = client.get_emojis()
-        if "error" in resp:
-            self.after(0, lambda: messagebox.showerror("Sync Error", resp["error"]))
-            self.after(0, lambda: self.status_label.config(text="Sync Failed"))
-            return
-
-        emojis = resp.get("emojis", [])
         count_new = 0
         
         layout_changed = False
-        for emo in emojis:
-            name = emo["name"]
-            emoji_map[name] = emo["string"]
-            
-            # Check existence in any category or hidden
-            exists = False
-            if name in palette_layout["hidden"]: exists = True
-            for cat in palette_layout["categories"].values():
-                if name in cat: exists = True; break
-            
-            if not exists:
-                palette_layout["hidden"].append(name)
-                count_new += 1
-                layout_changed = True
-            
-            self._check_and_download_icon(name, emo["url"], emo["animated"])
+        # Snapshot once: every download changes the directory and would force a rescan
+        icon_paths = dict(get_icon_paths())
+        # Every name already placed in a category or hidden; moves between lists don't change it
+        known = set(palette_layout["hidden"])
+        for cat_items in palette_layout["categories"].values():
+            known.update(cat_items)
+        try:
+            # Streamed: each emoji is processed as it arrives, its icon fetched in parallel.
+            # Leaving the with-block (even on error) waits for the downloads already queued.
+            with ThreadPoolExecutor(max_workers=SYNC_DOWNLOAD_WORKERS, thread_name_prefix="icon-dl") as downloads:
+                for emo in client.iter_emojis():
+                    name = emo["name"]
+                    emoji_map[name] = emo["string"]
+                
+                    if name not in known:
+                        palette_layout["hidden"].append(name)
+                        known.add(name)
+                        count_new += 1
+                        layout_changed = True
+                
+                    if name not in icon_paths:
+                        downloads.submit(self._download_icon, name, emo["url"], emo["animated"])
+        except Exception as e:
+            invalidate_code_index()
+            err = str(e)
+            self.after(0, lambda: messagebox.showerror("Sync Error", err))
+            self.after(0, lambda: self.status_label.config(text="Sync Failed"))
+            # Keep whatever arrived before the stream broke
+            if layout_changed:
+                save_palette_layout()
+                self.after(0, self.refresh_icons)
+            return
 
+        invalidate_code_index()
         if layout_changed: save_palette_layout()
-        self.after(0, self.render_palettes)
+        self.after(0, self.refresh_icons)
+        self.after(0, self.update_preview)
         self.after(0, lambda: self.status_label.config(text=f"Synced {count_new} new emojis (to Storage)."))
 
-    def _check_and_download_icon(self, name, url, animated):
-         for ext in [".png", ".gif", ".jpg", ".jpeg", ".webp"]:
-             if os.path.exists(os.path.join(EMOJI_IMG_DIR, name + ext)): return
-         
+    def _download_icon(self, name, url, animated):
          try:
-             img_resp = requests.get(url, timeout=10)
-             if img_resp.status_code == 200:
+             with self.download_session.get(url, timeout=10, stream=True) as img_resp:
+                 if img_resp.status_code != 200: return
                  ext = ".gif" if animated else ".png"
                  dest = os.path.join(EMOJI_IMG_DIR, name + ext)
-                 with open(dest, "wb") as f: f.write(img_resp.content)
+                 # Stream to a tmp file so a half-finished download is never picked up as an icon
+                 with open(dest + ".part", "wb") as f:
+                     for chunk in img_resp.iter_content(65536): f.write(chunk)
+                 os.replace(dest + ".part", dest)
+                 # Decode + downscale now, on the sync worker, so the first render only reads a 32x32 PNG
+                 bake_thumbnail(dest, thumb_path(name))
          except: pass
 
     def import_emoji(self):
@@ -635,20 +1055,20 @@ class NyxControlApp(tk.Tk):
         if not discord_id: return
         
         try:
-            img = Image.open(file_path)
-            if hasattr(img, 'is_animated') and img.is_animated: img.seek(0)
+            img = Image.open(file_path, formats=ICON_FORMATS) # First frame for animated files
             dest = os.path.join(EMOJI_IMG_DIR, f"{name}.png")
             img.save(dest, "PNG")
+            bake_thumbnail(dest, thumb_path(name))
             
-            emoji_map[name] = discord_id
-            with open(EMOJI_DB_FILE, "w") as f: json.dump(emoji_map, f, indent=4)
+            record_emoji(name, discord_id)
+            invalidate_code_index()
             
             if name not in palette_layout["categories"]["Other"]:
                 palette_layout["categories"]["Other"].append(name)
                 save_palette_layout()
             
-            self.icon_cache.pop(name, None)
-            self.render_palettes()
+            self.refresh_icons() # Sees the rewritten file's new mtime and drops the cached icon
+            self.update_preview()
         except Exception as e: messagebox.showerror("Error", str(e))
 
     def clear_text(self):
@@ -664,55 +1084,141 @@ class NyxControlApp(tk.Tk):
             self.text_entry.insert(0, new_text)
             self.update_preview()
 
+    def schedule_preview(self, event=None):
+        """Coalesces keystrokes into at most one update_preview per frame."""
+        # Not re-armed per key: continuous typing still repaints every frame instead of waiting for a pause
+        if self.preview_after_id is None:
+            self.preview_after_id = self.after(PREVIEW_FRAME_MS, self.update_preview)
+
     def update_preview(self, event=None):
-        self.preview_canvas.delete("all")
-        text = self.text_entry.get()
+        # A direct call supersedes any pending debounced one
+        if self.preview_after_id:
+            self.after_cancel(self.preview_after_id)
+            self.preview_after_id = None
         
-        x = 5
-        y = 20
+        text = self.text_entry.get()
+        # Modifier keys, arrows etc. fire <KeyRelease> without changing anything;
+        # a rebuilt code index (import/sync) is a new object, so it still re-renders
+        code_index = get_code_index()
+        if text == self.last_preview_text and code_index is self.last_preview_index: return
+        self.last_preview_text, self.last_preview_index = text, code_index
         
-        sorted_emojis = sorted(emoji_map.items(), key=lambda x: len(x[1]), reverse=True)
-        temp_text = text
-        for name, code in sorted_emojis:
-            temp_text = temp_text.replace(code, f"|{name}|")
-            
-        parts = re.split(r'\|(.*?)\|', temp_text)
+        # Single pass: split text into (emoji name or None, text) tokens
+        pattern, code_to_name = code_index
+        tokens = []
+        pos = 0
+        if pattern:
+            for m in pattern.finditer(text):
+                name = code_to_name.get(m.group())
+                if name is None: continue # Unknown emoji: stays part of the surrounding text
+                if m.start() > pos: tokens.append((None, text[pos:m.start()]))
+                tokens.append((name, m.group()))
+                pos = m.end()
+        if pos < len(text): tokens.append((None, text[pos:]))
         
-        for part in parts:
-            if part in emoji_map:
-                icon = self.load_icon(part)
-                discord_str = emoji_map[part]
-                
-                item_id = None
+        # Lay tokens out as (kind, item options, removable code) specs
+        wanted = []
+        x = 5
+        for name, part in tokens:
+            if name:
+                icon = self.load_icon(name)
                 if icon:
-                    item_id = self.preview_canvas.create_image(x, y, image=icon, anchor="w")
+                    wanted.append((("image", (("image", icon),), part), x))
                     x += 34
                 else:
-                    item_id = self.preview_canvas.create_text(x, y, text=f"[{part}]", fill="#7289DA", anchor="w", font=("Segoe UI", 9))
+                    wanted.append((("text", (("text", f"[{name}]"), ("fill", "#7289DA"), ("font", ("Segoe UI", 9))), part), x))
                     x += 60
-                
-                if item_id:
-                    self.preview_canvas.tag_bind(item_id, "<Button-3>", lambda e, s=discord_str: self.remove_emoji_from_bar(s))
-                    
             else:
-                self.preview_canvas.create_text(x, y, text=part, fill="white", anchor="w", font=("Consolas", 10))
-                width = len(part) * 8
-                x += width
+                wanted.append((("text", (("text", part), ("fill", "white"), ("font", self.preview_font)), None), x))
+                x += self.measure_text(part)
+        
+        self._sync_preview_items(wanted, 20)
+
+    def _sync_preview_items(self, wanted, y):
+        """Diffs wanted (spec, x) pairs against the last render and only touches canvas items that changed."""
+        canvas = self.preview_canvas
+        old = self.preview_items
+        n_old, n_new = len(old), len(wanted)
+        
+        # Unchanged head and tail by spec; an edit mid-text only shifts the tail's x
+        prefix = 0
+        while prefix < min(n_old, n_new) and old[prefix][0] == wanted[prefix][0]:
+            prefix += 1
+        suffix = 0
+        while suffix < min(n_old, n_new) - prefix and old[n_old - 1 - suffix][0] == wanted[n_new - 1 - suffix][0]:
+            suffix += 1
+        
+        items = []
+        for (spec, x), (_, old_x, item_id) in zip(wanted[:prefix], old[:prefix]):
+            if old_x != x: canvas.coords(item_id, x, y)
+            items.append((spec, x, item_id))
+        
+        # Changed middle: reuse items positionally where the type matches
+        old_mid = old[prefix:n_old - suffix]
+        for i, (spec, x) in enumerate(wanted[prefix:n_new - suffix]):
+            kind, opts, code = spec
+            item_id = None
+            if i < len(old_mid):
+                old_spec, _, item_id = old_mid[i]
+                if old_spec[0] == kind:
+                    # Same item type: mutate in place
+                    canvas.itemconfigure(item_id, tags=("removable",) if code else (), **dict(opts))
+                    canvas.coords(item_id, x, y)
+                else:
+                    canvas.delete(item_id)
+                    item_id = None
+            
+            if item_id is None:
+                create = canvas.create_image if kind == "image" else canvas.create_text
+                item_id = create(x, y, anchor="w", tags=("removable",) if code else (), **dict(opts))
+            items.append((spec, x, item_id))
+        
+        # Middle items that no longer exist
+        for _, _, item_id in old_mid[n_new - suffix - prefix:]:
+            canvas.delete(item_id)
+        
+        for (spec, x), (_, old_x, item_id) in zip(wanted[n_new - suffix:], old[n_old - suffix:]):
+            if old_x != x: canvas.coords(item_id, x, y)
+            items.append((spec, x, item_id))
+        
+        self.preview_items = items
+        self.preview_codes = {item_id: spec[2] for spec, _, item_id in items if spec[2]}
+
+    def on_preview_right_click(self, event):
+        # One binding on the "removable" tag; the item under the pointer says which emoji
+        current = self.preview_canvas.find_withtag("current")
+        code = self.preview_codes.get(current[0]) if current else None
+        if code: self.remove_emoji_from_bar(code)
 
     # ... (Presets, Poll API, Send State, Send Text, Update UI - Same as before)
     def refresh_presets_list(self):
-        self.presets_listbox.delete(0, tk.END)
-        for name in sorted(presets.keys()):
-             self.presets_listbox.insert(tk.END, name)
+        # Patch from the first differing row instead of clearing and re-inserting everything
+        entries = sorted(presets.keys())
+        old = self.presets_entries
+        k = 0
+        for a, b in zip(old, entries):
+            if a != b: break
+            k += 1
+        if k == len(old) == len(entries): return
+        
+        self.presets_listbox.delete(k, tk.END)
+        if k < len(entries):
+            self.presets_listbox.insert(tk.END, *entries[k:])
+        self.presets_entries = entries
 
     def add_preset(self):
         text = self.text_entry.get()
         if not text: return
         name = simpledialog.askstring("Save Preset", "Enter name for this preset:")
         if name:
+            is_new = name not in presets
             presets[name] = text
             save_presets()
-            self.refresh_presets_list()
+            if is_new:
+                # Sorted entries are kept in step, so only the new row is inserted
+                k = bisect.bisect_left(self.presets_entries, name)
+                self.presets_entries.insert(k, name)
+                self.presets_listbox.insert(k, name)
 
     def on_preset_select(self, event):
         selection = self.presets_listbox.curselection()
@@ -734,46 +1240,81 @@ class NyxControlApp(tk.Tk):
         if messagebox.askyesno("Delete Preset", f"Delete preset '{name}'?"):
             del presets[name]
             save_presets()
-            self.refresh_presets_list()
+            k = bisect.bisect_left(self.presets_entries, name)
+            del self.presets_entries[k]
+            self.presets_listbox.delete(k)
 
     def poll_api(self):
-        def _poll():
-            status = client.get_status()
-            self.after(0, lambda: self.update_ui(status, None))
-        threading.Thread(target=_poll, daemon=True).start()
-        self.after(2000, self.poll_api)
+        # One long-lived worker feeds statuses through a queue; the Tk thread drains it
+        self.poll_queue = queue.Queue()
+        self.poll_stop = threading.Event()
+        threading.Thread(target=self._poll_loop, daemon=True).start()
+        self.drain_poll_queue()
+
+    def _poll_loop(self):
+        while not self.poll_stop.is_set():
+            self.poll_queue.put(client.get_status())
+            self.poll_stop.wait(POLL_INTERVAL)
+
+    def drain_poll_queue(self):
+        latest = None
+        try:
+            while True: latest = self.poll_queue.get_nowait()
+        except queue.Empty: pass
+        
+        if latest: self.update_ui(latest)
+        self.after(100, self.drain_poll_queue)
+
+    def destroy(self):
+        if hasattr(self, "poll_stop"): self.poll_stop.set()
+        # Don't lose debounced saves that haven't fired yet
+        flush_pending_saves()
+        super().destroy()
 
-    def update_ui(self, status, bars):
+    def update_ui(self, status):
         if "error" in status:
-            self.status_indicator.config(fg="red")
-            self.status_label.config(text=f"Offline ({status['error']})")
+            text, color, ping = f"Offline ({status['error']})", "red", None
         else:
-            self.status_indicator.config(fg="green")
-            self.status_label.config(text=f"Online: {status.get('user', 'NyxOS')}")
-            self.latency_label.config(text=f"Ping: {status.get('latency')}ms")
+            self.online_text = f"Online: {status.get('user', 'NyxOS')}"
+            text, color, ping = self.online_text, "green", f"Ping: {status.get('latency')}ms"
+        
+        # Only configure what changed (the status line is also borrowed by hover/sync messages)
+        if text != self.shown_status[0]: self.status_label.config(text=text)
+        if color != self.shown_status[1]: self.status_indicator.config(fg=color)
+        if ping is not None and ping != self.shown_status[2]: self.latency_label.config(text=ping)
+        self.shown_status = (text, color, ping if ping is not None else self.shown_status[2])
 
     def send_state(self, action):
-        threading.Thread(target=client.set_global_state, args=(action,), daemon=True).start()
+        future = self.net_pool.submit(client.set_global_state, action)
+        future.add_done_callback(lambda f: self.after(0, self._on_state_sent, f.result()))
+
+    def _on_state_sent(self, resp):
+        if "error" in resp:
+            messagebox.showerror("Error", resp["error"])
 
     def send_text_update(self):
         text = self.text_entry.get()
         if not text: return
         
-        for name, code in emoji_map.items():
-            if code in text:
-                palette_layout["use_counts"][name] = palette_layout["use_counts"].get(name, 0) + 1
+        # Each emoji present counts once, found via the cached code index
+        pattern, code_to_name = get_code_index()
+        used = {code_to_name.get(m.group()) for m in pattern.finditer(text)} if pattern else set()
+        used.discard(None)
+        for name in used:
+            palette_layout["use_counts"][name] = palette_layout["use_counts"].get(name, 0) + 1
         save_palette_layout()
         
-        def _send():
-            resp = client.set_global_text(text)
-            if "error" in resp:
-                self.after(0, lambda: messagebox.showerror("Error", resp["error"]))
-            else:
-                self.after(0, self.bell)
-                self.after(0, lambda: self.status_label.config(text="Update Sent!"))
-                self.after(2000, lambda: self.status_label.config(text=f"Online: {client.get_status().get('user', 'NyxOS')}"))
+        future = self.net_pool.submit(client.set_global_text, text)
+        future.add_done_callback(lambda f: self.after(0, self._on_text_sent, f.result()))
 
-        threading.Thread(target=_send, daemon=True).start()
+    def _on_text_sent(self, resp):
+        if "error" in resp:
+            messagebox.showerror("Error", resp["error"])
+        else:
+            self.bell()
+            self.status_label.config(text="Update Sent!")
+            # Last polled status; no blocking request from the Tk thread
+            self.after(2000, lambda: self.status_label.config(text=self.online_text))
 
 if __name__ == "__main__":
     try:
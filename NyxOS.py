@@ -5,7 +5,6 @@ import logging
 import asyncio
 import os
 import sys
-import base64
 import json
 import re
 import time
@@ -99,6 +98,56 @@ intents.message_content = True
 intents.guilds = True
 intents.members = True
 
+class ChannelHistoryCache:
+    """
+    Per-channel ring buffer of the latest messages, fed from on_message, so building
+    LLM context doesn't re-fetch channel history over REST on every reply.
+    Edits and deletes are applied from the raw gateway events, which also covers backfilled
+    messages that discord.py's own message cache never saw.
+    A channel is backfilled from the API once, the first time its history is read.
+    """
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self._channels = {} # channel_id -> deque of Messages, oldest first
+        self._seeded = set()
+
+    def remember(self, message):
+        dq = self._channels.get(message.channel.id)
+        if dq is None:
+            dq = self._channels[message.channel.id] = deque(maxlen=self.maxlen)
+        dq.append(message)
+
+    def replace(self, message):
+        """Swaps in the edited version of a buffered message (no-op if it isn't buffered)."""
+        dq = self._channels.get(message.channel.id)
+        if not dq: return
+        for i, m in enumerate(dq):
+            if m.id == message.id:
+                dq[i] = message
+                return
+
+    def forget(self, channel_id, message_ids):
+        dq = self._channels.get(channel_id)
+        if not dq: return
+        gone = [m for m in dq if m.id in message_ids]
+        for m in gone: dq.remove(m)
+
+    async def recent(self, message, limit):
+        """Up to `limit` messages sent before `message` in its channel, newest first (like channel.history)."""
+        channel = message.channel
+        dq = self._channels.get(channel.id) or deque(maxlen=self.maxlen)
+        if channel.id not in self._seeded:
+            self._seeded.add(channel.id)
+            try:
+                fetched = [m async for m in channel.history(limit=self.maxlen, before=dq[0] if dq else message)]
+            except Exception:
+                self._seeded.discard(channel.id)
+                raise
+            # Re-read the deque: messages that arrived during the fetch were appended to it
+            newer = self._channels.get(channel.id, dq)
+            dq = self._channels[channel.id] = deque([*reversed(fetched), *newer], maxlen=self.maxlen)
+        return [m for m in reversed(dq) if m.id < message.id][:limit]
+
 class LMStudioBot(discord.Client):
     def __init__(self):
         super().__init__(intents=intents)
@@ -106,14 +155,18 @@ class LMStudioBot(discord.Client):
         
         # Runtime State
         self.channel_cutoff_times = OrderedDict()
-        self.good_bot_cooldowns = OrderedDict() 
+        # user_id -> last good-bot timestamp; entries drop out by themselves once the cooldown has passed
+        self.good_bot_cooldowns = services.ExpiringLRU(maxsize=10000, ttl=config.GOOD_BOT_COOLDOWN_SECONDS)
         self.processing_locks = set() 
         self.active_views = OrderedDict() 
         self.active_bars = {}
         self.bar_history = {} # Mapping channel_id -> deque(maxlen=2)
         self.bar_drop_cooldowns = {}
-        self.last_bot_message_id = {} 
-        self.boot_cleared_channels = set()
+        self.last_bot_message_id = OrderedDict() # channel_id -> our latest reply there (LRU, see _update_lru_cache)
+        self.boot_cleared_channels = set() # Never pruned: forgetting a channel would wipe its memory again
+        self.history_cache = ChannelHistoryCache(config.CONTEXT_WINDOW + 5)
+        # (message id, content) -> is_proxy_trigger_message verdict; expires with the PK data it was based on
+        self.proxy_trigger_cache = services.ExpiringLRU(maxsize=2048, ttl=services.APIService.PK_CACHE_TTL)
         self.has_synced = False
         self.abort_signals = set()
         self.active_drop_tasks = set()
@@ -188,6 +241,39 @@ class LMStudioBot(discord.Client):
             # Explicitly remove from active_views memory
             self.active_views.pop(old_id, None)
 
+    async def is_proxy_trigger_message(self, msg):
+        """
+        True if a (non-webhook) message is a proxy trigger that shouldn't enter LLM history.
+        Verdicts are memoized per (message id, content): the same history is replayed on every reply.
+        """
+        key = (msg.id, msg.content)
+        verdict = self.proxy_trigger_cache.get(key)
+        if verdict is None:
+            verdict = await self._check_proxy_trigger(msg)
+            # A "no" may just mean PK was unreachable, so it is re-checked sooner
+            self.proxy_trigger_cache.set(key, verdict, ttl=None if verdict else services.APIService.PK_NEGATIVE_TTL)
+        return verdict
+
+    async def _check_proxy_trigger(self, msg):
+        # 0. Check Hardcoded Proxy Tags (Memory Sanitization)
+        # Filter out any message in history that starts with a hardcoded tag
+        if msg.content.strip().startswith(tuple(getattr(config, 'HARDCODED_PROXY_TAGS', ()))):
+            return True
+
+        # 1. Check My System Tags (Self-proxy)
+        tags = await services.service.get_system_proxy_tags(config.MY_SYSTEM_ID)
+        if helpers.matches_proxy_tag(msg.content, tags): return True
+
+        # 2. Check Author's System Tags (Other-proxy)
+        # This prevents "double vision" where the bot sees both the user's trigger command AND the resulting webhook
+        try:
+            user_sys = await services.service.get_pk_user_data(msg.author.id)
+            if user_sys and user_sys.get('system_id'):
+                user_tags = await services.service.get_system_proxy_tags(user_sys['system_id'])
+                if helpers.matches_proxy_tag(msg.content, user_tags): return True
+        except: pass
+        return False
+
     def _update_lru_cache(self, cache_dict, key, value, limit=1000):
         """Updates an OrderedDict cache with LRU eviction."""
         if key in cache_dict:
@@ -1960,12 +2046,13 @@ class LMStudioBot(discord.Client):
         
         # Check for restart metadata
         restart_data = None
-        if os.path.exists(config.RESTART_META_FILE):
-            try:
-                with open(config.RESTART_META_FILE, "r") as f:
-                    restart_data = json.load(f)
-                os.remove(config.RESTART_META_FILE)
-            except: pass
+        rm_path = config.RESTART_META_FILE
+        try:
+            with open(rm_path, "r") as f:
+                restart_data = json.load(f)
+            os.remove(rm_path)
+        except FileNotFoundError: pass # Normal boot, not a restart
+        except: pass
 
         # Load Whitelist EARLY to avoid UnboundLocalError
         bar_whitelist = memory_manager.get_bar_whitelist()
@@ -2015,11 +2102,38 @@ class LMStudioBot(discord.Client):
         except Exception as e:
             logger.error(f"Failed to start terminal listener: {e}")
 
+    async def on_guild_emojis_update(self, guild, before, after):
+        """Invalidates the API emoji cache when the Temple Guild's emojis change."""
+        if guild.id == config.TEMPLE_GUILD_ID:
+            self.api_server.invalidate_emoji_cache()
+
+    async def on_guild_channel_update(self, before, after):
+        """Invalidates the API bar list when a bar channel (or its category) is renamed or moved."""
+        if after.id in self.active_bars:
+            self.api_server.invalidate_bars_cache()
+        elif isinstance(after, discord.CategoryChannel):
+            # Bar entries carry their category's name
+            if any(getattr(self.get_channel(cid), "category_id", None) == after.id for cid in self.active_bars):
+                self.api_server.invalidate_bars_cache()
+
+    async def on_guild_channel_delete(self, channel):
+        if channel.id in self.active_bars:
+            self.api_server.invalidate_bars_cache()
+
+    async def on_raw_message_edit(self, payload):
+        # Backfilled messages aren't in discord.py's cache, so edits have to be copied in
+        self.history_cache.replace(payload.message)
+
+    async def on_raw_bulk_message_delete(self, payload):
+        self.history_cache.forget(payload.channel_id, payload.message_ids)
+
     async def on_raw_message_delete(self, payload):
         """
         Detects when a message is manually deleted by a user.
         If the deleted message is a Status Bar, we clean up its DB entry and Console listing.
         """
+        # Deleted messages (e.g. PluralKit-proxied originals) must not stay in the LLM context
+        self.history_cache.forget(payload.channel_id, (payload.message_id,))
         try:
             # Ignore if this deletion was initiated by the bot (e.g. during a move/drop)
             if payload.message_id in self.pending_drops:
@@ -3042,10 +3156,7 @@ class LMStudioBot(discord.Client):
                 "bar_msg_id": bar_msg.id if bar_msg else None
             }
             try:
-                with open(config.RESTART_META_FILE, "w") as f:
-                    json.dump(meta, f)
-                    f.flush()
-                    os.fsync(f.fileno())
+                helpers.atomic_write(config.RESTART_META_FILE, json.dumps(meta))
             except Exception as e:
                 logger.error(f"Failed to write restart meta: {e}")
         else:
@@ -3301,7 +3412,7 @@ async def clearmemory_command(interaction: discord.Interaction):
     # Update cutoff time to NOW
     client._update_lru_cache(client.channel_cutoff_times, interaction.channel_id, interaction.created_at, limit=500)
     
-    memory_manager.clear_channel_memory(interaction.channel_id, interaction.channel.name)
+    await asyncio.to_thread(memory_manager.clear_channel_memory, interaction.channel_id, interaction.channel.name)
     await interaction.response.send_message("✅", ephemeral=True, delete_after=0.5)
 
 @client.tree.command(name="bugreport", description="Submit a bug report.")
@@ -3311,17 +3422,11 @@ async def bugreport_command(interaction: discord.Interaction):
 
 @client.tree.command(name="goodbot", description="Show the Good Bot Leaderboard.")
 async def good_bot_leaderboard(interaction: discord.Interaction):
-    leaderboard = memory_manager.get_good_bot_leaderboard()
-    if not leaderboard:
+    chart_text = ui.format_good_bot_chart()
+    if not chart_text:
         await interaction.response.send_message(ui.FLAVOR_TEXT["NO_GOOD_BOTS"], ephemeral=False)
         return
 
-    total_good_bots = sum(user['count'] for user in leaderboard)
-    chart_text = ui.FLAVOR_TEXT["GOOD_BOT_HEADER"]
-    for i, user_data in enumerate(leaderboard[:10], 1):
-        chart_text += f"**{i}.** {user_data['username']} — **{user_data['count']}**\n"
-    chart_text += f"\n**Total:** {total_good_bots} Good Bots 💙"
-    
     await interaction.response.send_message(chart_text, ephemeral=False)
 
 @client.tree.command(name="cleargoodbots", description="Clear the Good Bot leaderboard (Admin Only).")
@@ -4383,6 +4488,7 @@ async def on_message_edit(before, after):
 async def on_message(message):
     # Volition: Update Buffer (Tracks everyone, including self)
     await client.volition.update_buffer(message)
+    client.history_cache.remember(message)
 
     if message.author == client.user: return
 
@@ -4592,7 +4698,7 @@ async def on_message(message):
         if client.user in message.mentions: should_respond = True
         
         # Combine all trigger roles (Bot, Admin, Special)
-        TRIGGER_ROLES = set(config.BOT_ROLE_IDS + config.ADMIN_ROLE_IDS + config.SPECIAL_ROLE_IDS)
+        TRIGGER_ROLES = set().union(config.BOT_ROLE_IDS, config.ADMIN_ROLE_IDS, config.SPECIAL_ROLE_IDS)
 
         if not should_respond:
             if message.role_mentions:
@@ -4739,8 +4845,8 @@ async def on_message(message):
 
             if message.channel.id not in client.boot_cleared_channels:
                 logger.info(f"🧹 First message in #{message.channel.name} since boot. Wiping memory.")
-                memory_manager.clear_channel_memory(message.channel.id, message.channel.name)
                 client.boot_cleared_channels.add(message.channel.id)
+                await asyncio.to_thread(memory_manager.clear_channel_memory, message.channel.id, message.channel.name)
 
             client.processing_locks.add(message.id)
             logger.info(f"Processing Message from {message.author.name} (ID: {message.id})")
@@ -4751,18 +4857,15 @@ async def on_message(message):
                     if message.attachments:
                         for att in message.attachments:
                             safe_mime = helpers.get_safe_mime_type(att)
-                            if safe_mime.startswith('image/') and att.size < 8 * 1024 * 1024:
+                            if safe_mime.startswith('image/') and att.size < helpers.MAX_INLINE_IMAGE_BYTES:
                                 try:
-                                    img_bytes = await att.read()
-                                    b64_str = base64.b64encode(img_bytes).decode('utf-8')
-                                    image_data_uri = f"data:{safe_mime};base64,{b64_str}"
+                                    image_data_uri = await helpers.get_image_data_uri(att, safe_mime)
                                     break
                                 except Exception as e: logger.warning(f"⚠️ Error processing image: {e}")
 
-                    clean_prompt = re.sub(r'<@!?{}>'.format(client.user.id), '', message.content)
-                    for rid in config.BOT_ROLE_IDS: clean_prompt = re.sub(r'<@&{}>'.format(rid), '', clean_prompt)
-                    clean_prompt = clean_prompt.replace(f"@{client.user.display_name}", "").replace(f"@{client.user.name}", "")
-                    clean_prompt = clean_prompt.strip().replace("? ?", "?").replace("! ?", "!?").replace('[', '(').replace(']', ')')
+                    bot_names = (client.user.display_name, client.user.name)
+                    clean_prompt = helpers.strip_bot_mentions(message.content, client.user.id, config.BOT_ROLE_IDS, bot_names)
+                    clean_prompt = clean_prompt.strip().replace("? ?", "?").replace("! ?", "!?").translate(helpers.BRACKET_TO_PAREN)
 
                     force_search = False
                     if "&web" in clean_prompt:
@@ -4841,7 +4944,7 @@ async def on_message(message):
                     # Identity Suffix uses new Config logic
                     identity_suffix = helpers.get_identity_suffix(member_obj or sender_id, system_id, clean_name, services.service.my_system_members)
 
-                    memory_manager.log_conversation(message.channel.name, real_name, sender_id or "UNKNOWN_ID", clean_prompt)
+                    memory_manager.queue_log_conversation(message.channel.name, real_name, sender_id or "UNKNOWN_ID", clean_prompt)
 
                     # History
                     history_messages = []
@@ -4854,7 +4957,7 @@ async def on_message(message):
                         active_bar_id = bar_data.get("message_id")
                         active_check_id = bar_data.get("checkmark_message_id")
 
-                    async for prev_msg in message.channel.history(limit=config.CONTEXT_WINDOW + 5, before=message):
+                    for prev_msg in await client.history_cache.recent(message, config.CONTEXT_WINDOW + 5):
                         cutoff = client.channel_cutoff_times.get(message.channel.id)
                         if cutoff and prev_msg.created_at < cutoff: break
                         
@@ -4862,36 +4965,14 @@ async def on_message(message):
                         if prev_msg.id == active_bar_id or prev_msg.id == active_check_id:
                             continue
 
-                        if prev_msg.webhook_id is None:
-                                # 0. Check Hardcoded Proxy Tags (Memory Sanitization)
-                                # Filter out any message in history that starts with a hardcoded tag
-                                if hasattr(config, 'HARDCODED_PROXY_TAGS'):
-                                    should_skip = False
-                                    for tag in config.HARDCODED_PROXY_TAGS:
-                                        if prev_msg.content.strip().startswith(tag):
-                                            should_skip = True
-                                            break
-                                    if should_skip: continue
-
-                                # 1. Check My System Tags (Self-proxy)
-                                tags = await services.service.get_system_proxy_tags(config.MY_SYSTEM_ID)
-                                if helpers.matches_proxy_tag(prev_msg.content, tags): continue
-
-                                # 2. Check Author's System Tags (Other-proxy)
-                                # This prevents "double vision" where the bot sees both the user's trigger command AND the resulting webhook
-                                try:
-                                    user_sys = await services.service.get_pk_user_data(prev_msg.author.id)
-                                    if user_sys and user_sys.get('system_id'):
-                                        user_tags = await services.service.get_system_proxy_tags(user_sys['system_id'])
-                                        if helpers.matches_proxy_tag(prev_msg.content, user_tags): continue
-                                except: pass
+                        if prev_msg.webhook_id is None and await client.is_proxy_trigger_message(prev_msg):
+                            continue
 
                         p_content = prev_msg.clean_content.strip()
                         has_image_history = any(att.content_type and att.content_type.startswith('image/') for att in prev_msg.attachments)
                         if not p_content and not has_image_history: continue
                         
-                        p_content = p_content.replace(f"@{client.user.display_name}", "").replace(f"@{client.user.name}", "")
-                        p_content = re.sub(r'<@!?{}>'.format(client.user.id), '', p_content).strip().replace('[', '(').replace(']', ')')
+                        p_content = helpers.strip_bot_mentions(p_content, client.user.id, names=bot_names).strip().translate(helpers.BRACKET_TO_PAREN)
 
                         current_msg_content = []
                         if p_content: current_msg_content.append({"type": "text", "text": p_content})
@@ -4927,11 +5008,8 @@ async def on_message(message):
 
                     search_context = None
                     if search_queries:
-                        search_results_text = ""
-                        for q in search_queries:
-                            results = await services.service.search_kagi(q)
-                            search_results_text += f"Query: {q}\n{results}\n\n"
-                        search_context = search_results_text
+                        results_list = await services.service.search_kagi_many(search_queries)
+                        search_context = "".join(f"Query: {q}\n{results}\n\n" for q, results in zip(search_queries, results_list))
                     
                     # YouTube Transcript Fetching
                     youtube_context = None
@@ -4996,7 +5074,7 @@ async def on_message(message):
                     response_text = helpers.sanitize_llm_response(response_text)
                     
                     # 2. Log processed text
-                    memory_manager.log_conversation(message.channel.name, "NyxOS", client.user.id, response_text)
+                    memory_manager.queue_log_conversation(message.channel.name, "NyxOS", client.user.id, response_text)
                     
                     # 3. Restore formatting for Discord display
                     response_text = helpers.restore_hyperlinks(response_text)
@@ -5008,10 +5086,10 @@ async def on_message(message):
                         prev_msg_id = client.last_bot_message_id.get(message.channel.id)
                         if prev_msg_id and prev_msg_id in client.active_views:
                             prev_view = client.active_views[prev_msg_id]
-                            for child in prev_view.children:
-                                if getattr(child, "custom_id", "") == "good_bot_btn":
-                                    child.disabled = True
-                                    child.label = "Good Bot!"
+                            child = ui.find_button(prev_view, "good_bot_btn")
+                            if child:
+                                child.disabled = True
+                                child.label = "Good Bot!"
                             try:
                                 old_msg = await message.channel.fetch_message(prev_msg_id)
                                 await services.service.limiter.wait_for_slot("edit_message", message.channel.id)
@@ -5030,7 +5108,7 @@ async def on_message(message):
                         
                         if sent_message:
                             client._register_view(sent_message.id, view)
-                            client.last_bot_message_id[message.channel.id] = sent_message.id
+                            client._update_lru_cache(client.last_bot_message_id, message.channel.id, sent_message.id, limit=500)
 
                             # --- SAVE VIEW STATE FOR PERSISTENCE ---
                             view_data = {
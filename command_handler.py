@@ -73,10 +73,7 @@ async def handle_prefix_command(client, message):
         await message.channel.send(ui.FLAVOR_TEXT["REBOOT_MESSAGE"])
         meta = {"channel_id": message.channel.id}
         try:
-            with open(config.RESTART_META_FILE, "w") as f:
-                json.dump(meta, f)
-                f.flush()
-                os.fsync(f.fileno())
+            helpers.atomic_write(config.RESTART_META_FILE, json.dumps(meta))
         except Exception as e:
             logger.warning(f"⚠️ Failed to write restart metadata: {e}")
         await client.close()
@@ -112,9 +109,9 @@ async def handle_prefix_command(client, message):
             return True
         
         # Update cutoff time to NOW
-        client.channel_cutoff_times[message.channel.id] = message.created_at
+        client._update_lru_cache(client.channel_cutoff_times, message.channel.id, message.created_at, limit=500)
         
-        memory_manager.clear_channel_memory(message.channel.id, message.channel.name)
+        await asyncio.to_thread(memory_manager.clear_channel_memory, message.channel.id, message.channel.name)
         await message.channel.send(ui.FLAVOR_TEXT["CLEAR_MEMORY_DONE"])
         return True
 
@@ -125,15 +122,10 @@ async def handle_prefix_command(client, message):
 
     # &goodbot
     if cmd == "&goodbot":
-        leaderboard = memory_manager.get_good_bot_leaderboard()
-        if not leaderboard:
+        chart_text = ui.format_good_bot_chart()
+        if not chart_text:
             await message.channel.send(ui.FLAVOR_TEXT["NO_GOOD_BOTS"])
             return True
-        total_good_bots = sum(user['count'] for user in leaderboard)
-        chart_text = ui.FLAVOR_TEXT["GOOD_BOT_HEADER"]
-        for i, user_data in enumerate(leaderboard[:10], 1):
-            chart_text += f"**{i}.** {user_data['username']} — **{user_data['count']}**\n"
-        chart_text += f"\n**Total:** {total_good_bots} Good Bots 💙"
         await message.channel.send(chart_text)
         return True
 
@@ -424,10 +416,7 @@ async def handle_prefix_command(client, message):
             # Restart Logic
             meta = {"channel_id": message.channel.id}
             try:
-                with open(config.RESTART_META_FILE, "w") as f:
-                    json.dump(meta, f)
-                    f.flush()
-                    os.fsync(f.fileno())
+                helpers.atomic_write(config.RESTART_META_FILE, json.dumps(meta))
             except Exception as e:
                 logger.warning(f"⚠️ Failed to write restart metadata: {e}")
             await client.close()
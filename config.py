@@ -1,6 +1,8 @@
 import os
+import ast
 import json
 import sys
+from functools import lru_cache
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -8,6 +10,7 @@ load_dotenv()
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+@lru_cache(maxsize=128)
 def get_path(filename):
     return os.path.join(BASE_DIR, filename)
 
@@ -18,8 +21,8 @@ def get_path(filename):
 # File/Directory Paths
 MEMORY_DIR = get_path("Memory")
 LOGS_DIR = get_path("Logs")
-RESTART_META_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "restart_meta.json")
-REFLECTION_STATE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reflection_state.json")
+RESTART_META_FILE = get_path("restart_meta.json")
+REFLECTION_STATE_FILE = get_path("reflection_state.json")
 DATABASE_FILE = os.path.abspath(get_path("nyxos.db"))
 BUFFER_FILE = get_path("buffer.txt")
 HEARTBEAT_FILE = get_path("heartbeat.txt")
@@ -48,35 +51,27 @@ KAGI_API_TOKEN = os.getenv("KAGI_API_TOKEN")
 SYSTEM_PROMPT = os.getenv("SYSTEM_PROMPT") or "You are a helpful assistant."
 INJECTED_PROMPT = os.getenv("INJECTED_PROMPT") or ""
 
-# Override from files if they exist
-system_prompt_path = get_path("system_prompt.txt")
-if os.path.exists(system_prompt_path):
+def read_prompt_file(filename, default):
+    """Returns the stripped contents of a prompt file next to config.py, or `default` if it's missing/unreadable."""
+    # Opened directly (no exists() probe first): a missing file costs one failed open
     try:
-        with open(system_prompt_path, "r", encoding="utf-8") as f:
-            SYSTEM_PROMPT = f.read().strip()
+        with open(get_path(filename), "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        return default
     except Exception as e:
-        print(f"⚠️ Warning: Failed to read system_prompt.txt: {e}")
+        print(f"⚠️ Warning: Failed to read {filename}: {e}")
+        return default
 
-injected_prompt_path = get_path("injected_prompt.txt")
-if os.path.exists(injected_prompt_path):
-    try:
-        with open(injected_prompt_path, "r", encoding="utf-8") as f:
-            INJECTED_PROMPT = f.read().strip()
-    except Exception as e:
-        print(f"⚠️ Warning: Failed to read injected_prompt.txt: {e}")
+# Override from files if they exist
+SYSTEM_PROMPT = read_prompt_file("system_prompt.txt", SYSTEM_PROMPT)
+INJECTED_PROMPT = read_prompt_file("injected_prompt.txt", INJECTED_PROMPT)
 
 INJECTED_TERMINAL_PROMPT = os.getenv("INJECTED_TERMINAL_PROMPT") or ""
-
-injected_terminal_prompt_path = get_path("injected_terminal_prompt.txt")
-if os.path.exists(injected_terminal_prompt_path):
-    try:
-        with open(injected_terminal_prompt_path, "r", encoding="utf-8") as f:
-            INJECTED_TERMINAL_PROMPT = f.read().strip()
-    except Exception as e:
-        print(f"⚠️ Warning: Failed to read injected_terminal_prompt.txt: {e}")
+INJECTED_TERMINAL_PROMPT = read_prompt_file("injected_terminal_prompt.txt", INJECTED_TERMINAL_PROMPT)
 
 # --- VARIABLES FROM CONFIG.TXT (LEGACY SUPPORT) ---
-# We initialize defaults here. If config.txt exists, we exec it to override.
+# We initialize defaults here. If config.txt exists, its assignments override them.
 # NOTE: Ideally, move these to .env
 
 ADMIN_ROLE_IDS = []
@@ -156,18 +151,36 @@ VOLITION_INTERVAL = 10  # Seconds between heartbeat checks
 TEMPLE_BACKUP_PASSWORD = os.getenv("TEMPLE_BACKUP_PASSWORD")
 WM_BACKUP_PASSWORD = os.getenv("WM_BACKUP_PASSWORD")
 
+def read_config_assignments(path):
+    """
+    Parses a config file of `NAME = <literal>` lines (strings, numbers, lists, dicts...) into a dict.
+    The file is never executed; assignments whose value isn't a plain literal are skipped with a warning.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    values = {}
+    for node in tree.body:
+        if not isinstance(node, ast.Assign): continue
+        try:
+            value = ast.literal_eval(node.value)
+        except ValueError:
+            print(f"⚠️ Warning: {os.path.basename(path)}:{node.lineno} is not a literal value, skipped.")
+            continue
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                values[target.id] = value
+    return values
+
 try:
-    with open(get_path("config.txt"), "r") as f:
-        exec(f.read(), globals())
+    globals().update(read_config_assignments(get_path("config.txt")))
 except FileNotFoundError:
     print("⚠️ Warning: config.txt not found. Using defaults.")
 except Exception as e:
     print(f"⚠️ Warning: Error loading config.txt: {e}")
 
 try:
-    with open(get_path("nyxcontrolconfig.txt"), "r") as f:
-        # Be careful with exec. It executes in the current scope.
-        exec(f.read(), globals())
+    globals().update(read_config_assignments(get_path("nyxcontrolconfig.txt")))
 except FileNotFoundError:
     pass
 except Exception as e:
@@ -177,12 +190,13 @@ print(f"DEBUG: CONTROL_API_KEY loaded as type: {type(CONTROL_API_KEY)}")
 # print(f"DEBUG: CONTROL_API_KEY value: {CONTROL_API_KEY}") # Uncomment if desperate
 
 # --- DATA SANITIZATION ---
-# Ensure IDs are integers to prevent auth failures
+# Ensure IDs are integers to prevent auth failures.
+# Frozensets: these are checked with `in` on every message, and never change after load.
 try:
-    ADMIN_ROLE_IDS = [int(uid) for uid in ADMIN_ROLE_IDS]
-    ADMIN_USER_IDS = [int(uid) for uid in ADMIN_USER_IDS]
-    SPECIAL_ROLE_IDS = [int(uid) for uid in SPECIAL_ROLE_IDS]
-    BOT_ROLE_IDS = [int(uid) for uid in BOT_ROLE_IDS]
+    ADMIN_ROLE_IDS = frozenset(int(uid) for uid in ADMIN_ROLE_IDS)
+    ADMIN_USER_IDS = frozenset(int(uid) for uid in ADMIN_USER_IDS)
+    SPECIAL_ROLE_IDS = frozenset(int(uid) for uid in SPECIAL_ROLE_IDS)
+    BOT_ROLE_IDS = frozenset(int(uid) for uid in BOT_ROLE_IDS)
 except Exception as e:
     print(f"⚠️ Warning: Failed to sanitize Role IDs: {e}")
 
@@ -202,6 +216,7 @@ if os.getenv("TTS_MODEL"): TTS_MODEL = os.getenv("TTS_MODEL")
 # New Configs
 BAR_DEBOUNCE_SECONDS = 3.0
 NOTIFICATION_EMOJI = "<a:SeraphExclamark:1317628268299554877>"
+GOOD_BOT_COOLDOWN_SECONDS = 5.0
 
 if os.getenv("BAR_DEBOUNCE_SECONDS"): BAR_DEBOUNCE_SECONDS = float(os.getenv("BAR_DEBOUNCE_SECONDS"))
 if os.getenv("NOTIFICATION_EMOJI"): NOTIFICATION_EMOJI = os.getenv("NOTIFICATION_EMOJI")
@@ -668,7 +668,7 @@ class Database:
                 return [{"user_id": r[0], "username": r[1], "count": r[2]} for r in rows]
         except Exception as e:
             logger.error(f"Failed to get leaderboard: {e}")
-            return []
+            return None
 
     def clear_user_scores(self):
         try:
@@ -12,7 +12,7 @@ print(f"BOT_ROLE_IDS: {config.BOT_ROLE_IDS}")
 print(f"ADMIN_ROLE_IDS: {config.ADMIN_ROLE_IDS}")
 print(f"SPECIAL_ROLE_IDS: {config.SPECIAL_ROLE_IDS}")
 
-trigger_roles = set(config.BOT_ROLE_IDS + config.ADMIN_ROLE_IDS + config.SPECIAL_ROLE_IDS)
+trigger_roles = set().union(config.BOT_ROLE_IDS, config.ADMIN_ROLE_IDS, config.SPECIAL_ROLE_IDS)
 print(f"TRIGGER_ROLES: {trigger_roles}")
 
 # Mock Message
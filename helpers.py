@@ -1,11 +1,66 @@
+import base64
 import mimetypes
+import os
 import re
+import time
+from functools import lru_cache
 from datetime import datetime, timedelta, timezone
 import logging
 import config
 
+try:
+    from zoneinfo import ZoneInfo
+    SYSTEM_TZ = ZoneInfo("America/Los_Angeles") # Pacific time, DST-aware
+except Exception:
+    SYSTEM_TZ = timezone(timedelta(hours=-8)) # No tz database (e.g. Windows without tzdata): fixed PST
+
 logger = logging.getLogger("Helpers")
 
+# Square brackets -> parentheses, in one pass (keeps user text from forming [text](url) markup)
+BRACKET_TO_PAREN = str.maketrans('[]', '()')
+
+# Bracketed decorations around display names: "Nyx [she/her]", "(Seraph)", "⛩ Tag ⛩", ...
+NAME_DECORATION_RE = re.compile(r'\s*([\[\(\{<\|⛩].*?[\]\}\)>\|⛩])\s*')
+
+# Pieces of sanitize_llm_response / restore_hyperlinks, compiled once instead of per reply
+LEADING_HEADER_RE = re.compile(r'^#+\s*')
+REPLY_CONTEXT_RE = re.compile(r'\s*\(re:.*?\)')
+PAREN_LINK_RE = re.compile(r'\((.+?)\)\s*\((https?://[^\s]+)\)')
+
+@lru_cache(maxsize=8)
+def _bot_mention_re(user_id, role_ids, names):
+    # Longest names first, so "@NyxOS" isn't cut down to "OS" by a shorter "@Nyx"
+    plain = sorted({str(n) for n in names if n}, key=len, reverse=True)
+    return re.compile("|".join([
+        rf'<@!?{user_id}>',
+        *(rf'<@&{rid}>' for rid in sorted(role_ids)),
+        *(f"@{re.escape(n)}" for n in plain),
+    ]))
+
+def strip_bot_mentions(text, user_id, role_ids=(), names=()):
+    """
+    Removes mentions of the bot user, of its roles, and plain-text "@name" references in one pass
+    (pattern built once per ID/name set).
+    """
+    return _bot_mention_re(user_id, frozenset(role_ids), tuple(names)).sub('', text)
+
+def atomic_write(path, data, mode="w", encoding="utf-8"):
+    """
+    Writes `data` to a temp file, fsyncs it, then os.replace()s it over `path`,
+    so a crash mid-write leaves either the old file or the new one, never a torn one.
+    """
+    tmp_path = f"{path}.tmp.{os.getpid()}"
+    try:
+        with open(tmp_path, mode, encoding=None if "b" in mode else encoding) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try: os.remove(tmp_path)
+        except OSError: pass
+        raise
+
 def generate_progress_bar(percent, length=15):
     """Generates a text-based progress bar."""
     percent = max(0, min(100, percent))
@@ -13,6 +68,13 @@ def generate_progress_bar(percent, length=15):
     bar = "█" * filled_length + "-" * (length - filled_length)
     return f"[{bar}]"
 
+MAX_INLINE_IMAGE_BYTES = 8 * 1024 * 1024 # Larger images aren't sent to the LLM at all
+
+async def get_image_data_uri(attachment, mime):
+    """Downloads an image attachment as a base64 data URI."""
+    img_bytes = await attachment.read()
+    return f"data:{mime};base64,{base64.b64encode(img_bytes).decode('ascii')}"
+
 def get_safe_mime_type(attachment):
     filename = attachment.filename.lower()
     
@@ -36,26 +98,35 @@ def get_safe_mime_type(attachment):
     # 4. Ultimate Fallback
     return 'image/png'
 
+_system_time_cache = (None, None) # (minute, (date_str, time_str))
+
 def get_system_time():
-    utc_now = datetime.now(timezone.utc)
-    pst_offset = timedelta(hours=-8) # PST
-    pst_now = utc_now.astimezone(timezone(pst_offset))
-    return pst_now.strftime("%A, %B %d, %Y"), pst_now.strftime("%I:%M %p")
+    # The strings only change once a minute, so every request within that minute shares one formatting pass
+    global _system_time_cache
+    minute = int(time.time()) // 60
+    if _system_time_cache[0] != minute:
+        now = datetime.now(SYSTEM_TZ)
+        _system_time_cache = (minute, (now.strftime("%A, %B %d, %Y"), now.strftime("%I:%M %p")))
+    return _system_time_cache[1]
 
-def matches_proxy_tag(content, tags):
+def compile_proxy_tags(tags):
+    """
+    Turns PluralKit proxy tag dicts ({'prefix': ..., 'suffix': ...}) into the tuple of
+    stripped (prefix, suffix) string pairs that matches_proxy_tag expects. Empty tags are dropped.
+    """
+    compiled = []
     for tag in tags:
         prefix = tag.get('prefix') or ""
         suffix = tag.get('suffix') or ""
         if not prefix and not suffix: continue
-        
-        c_clean = content.strip()
-        p_clean = prefix.strip()
-        s_clean = suffix.strip()
-        
-        match = True
-        if p_clean and not c_clean.startswith(p_clean): match = False
-        if s_clean and not c_clean.endswith(s_clean): match = False
-        if match: return True
+        compiled.append((prefix.strip(), suffix.strip()))
+    return tuple(compiled)
+
+def matches_proxy_tag(content, tags):
+    """`tags` comes from compile_proxy_tags. An empty prefix/suffix matches anything."""
+    c_clean = content.strip()
+    for prefix, suffix in tags:
+        if c_clean.startswith(prefix) and c_clean.endswith(suffix): return True
     return False
 
 def clean_name_logic(raw_name, system_tag=None):
@@ -65,7 +136,7 @@ def clean_name_logic(raw_name, system_tag=None):
         else:
             stripped_tag = system_tag.strip()
             if stripped_tag in name: name = name.replace(stripped_tag, "")
-    return re.sub(r'\s*([\[\(\{<\|⛩].*?[\]\}\)>\|⛩])\s*', '', name).strip()
+    return NAME_DECORATION_RE.sub('', name).strip()
 
 def get_identity_suffix(user_obj, system_id, member_name=None, my_system_members=None):
     """
@@ -172,7 +243,7 @@ def sanitize_llm_response(text):
     if not text: return ""
     
     # Strip markdown headers (#) at start of lines
-    text = re.sub(r'^#+\s*', '', text)
+    text = LEADING_HEADER_RE.sub('', text)
     text = text.replace('\n#', '\n') 
     
     # Remove Identity Tags
@@ -181,7 +252,7 @@ def sanitize_llm_response(text):
     text = text.replace("(Seraph)", "").replace("(Chiara)", "")
     
     # Remove reply context
-    text = re.sub(r'\s*\(re:.*?\)', '', text).strip()
+    text = REPLY_CONTEXT_RE.sub('', text).strip()
     
     return text
 
@@ -194,7 +265,7 @@ def restore_hyperlinks(text):
     if not text: return ""
     # Allow optional space between (Text) and (URL)
     # Allow ) inside URL (by using [^\s]+ instead of [^\s)] and relying on backtracking)
-    return re.sub(r'\((.+?)\)\s*\((https?://[^\s]+)\)', r'[\1](\2)', text)
+    return PAREN_LINK_RE.sub(r'[\1](\2)', text)
 
 def clean_text_for_tts(text):
     """
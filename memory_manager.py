@@ -3,14 +3,20 @@ import json
 from datetime import datetime
 import re
 import config
+import helpers
 import shutil
 import logging
 import asyncio
+import heapq
+from concurrent.futures import ThreadPoolExecutor
 from functools import partial
+from operator import itemgetter
 from database import Database
 
 logger = logging.getLogger("MemoryManager")
 
+SEARCH_RESULTS_RE = re.compile(r'<search_results>.*?</search_results>', re.DOTALL)
+
 # Initialize Database
 # This replaces the file-based storage for context buffers, scores, settings, etc.
 db = Database(config.DATABASE_FILE)
@@ -24,6 +30,9 @@ def wipe_all_memories():
         logger.error(f"Failed to wipe all memories: {e}")
 
 def wipe_all_logs():
+    # Close handles on the writer thread, after the lines already queued have been written.
+    # The rmtree below runs on this thread, so a line queued meanwhile can still recreate a file.
+    _LOG_WRITER.submit(close_log_handles).result()
     try:
         if os.path.exists(config.LOGS_DIR):
             shutil.rmtree(config.LOGS_DIR)
@@ -33,10 +42,11 @@ def wipe_all_logs():
 
 def nuke_database():
     """Wraps the DB nuke command and clears local caches."""
-    global _ALLOWED_CHANNELS_CACHE
+    global _ALLOWED_CHANNELS_CACHE, _GOOD_BOT_CACHE
     success = db.nuke_database()
     if success:
         _ALLOWED_CHANNELS_CACHE = None
+        _GOOD_BOT_CACHE = None
     return success
 
 # --- Master Bar & Whitelist (DB Facade) ---
@@ -125,25 +135,59 @@ def get_channel_location(channel_id):
 def get_all_locations():
     return db.get_all_locations()
 
-def log_conversation(channel_name, user_name, user_id, content):
-    """Writes to the human-readable daily logs (kept as files)."""
-    today = datetime.now().strftime("%Y-%m-%d")
+_LOG_HANDLES = {} # (day, safe_channel) -> append handle of that day's log file
+# One writer thread owns _LOG_HANDLES and keeps lines in the order they were queued
+_LOG_WRITER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="nyx-log")
+
+def close_log_handles():
+    """Closes every cached daily-log handle (day rollover, log wipe)."""
+    for f in _LOG_HANDLES.values():
+        try: f.close()
+        except Exception: pass
+    _LOG_HANDLES.clear()
+
+def _open_daily_log(today, safe_channel):
+    # First log of a new day: yesterday's handles won't be written again
+    if any(day != today for day, _ in _LOG_HANDLES):
+        close_log_handles()
+
     daily_log_dir = os.path.join(config.LOGS_DIR, today)
     os.makedirs(daily_log_dir, exist_ok=True)
-    
-    safe_channel = "".join(c for c in channel_name if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
     log_file = os.path.join(daily_log_dir, f"{safe_channel}.log")
-    
+
+    is_new = not os.path.exists(log_file)
+    f = open(log_file, "a", encoding="utf-8")
+    if is_new:
+        f.write(f"=== LOG STARTED: {today} ===\nSYSTEM PROMPT:\n{config.SYSTEM_PROMPT_TEMPLATE}\n====================================\n\n")
+    _LOG_HANDLES[(today, safe_channel)] = f
+    return f
+
+def log_conversation(channel_name, user_name, user_id, content, now=None):
+    """Writes to the human-readable daily logs (kept as files)."""
+    now = now or datetime.now()
+    today = now.strftime("%Y-%m-%d")
+    safe_channel = "".join(c for c in channel_name if c.isalnum() or c in (' ', '-', '_')).strip().replace(' ', '_')
+    key = (today, safe_channel)
+
     try:
-        if not os.path.exists(log_file):
-            with open(log_file, "w", encoding="utf-8") as f:
-                f.write(f"=== LOG STARTED: {today} ===\nSYSTEM PROMPT:\n{config.SYSTEM_PROMPT_TEMPLATE}\n====================================\n\n")
-        
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        with open(log_file, "a", encoding="utf-8") as f:
-            f.write(f"[{timestamp}] {user_name} [{user_id}]: {content}\n")
+        # Handles stay open for the day, so a log line is one write instead of stat + makedirs + open/close
+        f = _LOG_HANDLES.get(key) or _open_daily_log(today, safe_channel)
+        f.write(f"[{now.strftime('%H:%M:%S')}] {user_name} [{user_id}]: {content}\n")
+        f.flush() # Keep the file readable live / complete if we crash
     except Exception as e:
         logger.error(f"Failed to write to log: {e}")
+        # Don't keep reusing a handle that failed; reopen on the next line
+        broken = _LOG_HANDLES.pop(key, None)
+        if broken:
+            try: broken.close()
+            except Exception: pass
+
+def queue_log_conversation(channel_name, user_name, user_id, content):
+    """
+    Hands a log line to the writer thread so the event loop never waits on disk.
+    The timestamp is taken now, not when the line is eventually written.
+    """
+    return _LOG_WRITER.submit(log_conversation, channel_name, user_name, user_id, content, datetime.now())
 
 async def write_context_buffer(messages, channel_id, channel_name, append_response=None):
     """
@@ -155,7 +199,7 @@ async def write_context_buffer(messages, channel_id, channel_name, append_respon
     try:
         if append_response:
             # Sanitize response before storing
-            clean_resp = append_response.replace('[', '(').replace(']', ')')
+            clean_resp = append_response.translate(helpers.BRACKET_TO_PAREN)
             content = f"[ASSISTANT_REPLY]\n{clean_resp}\n\n"
             # Run DB update in executor to avoid blocking the event loop
             await loop.run_in_executor(None, db.append_to_context_buffer, channel_id, content)
@@ -182,9 +226,9 @@ async def write_context_buffer(messages, channel_id, channel_name, append_respon
             
             if isinstance(content, str):
                 if "<search_results>" in content:
-                    content = re.sub(r'<search_results>.*?</search_results>', '(WEB SEARCH RESULTS OMITTED FROM LOG)', content, flags=re.DOTALL)
+                    content = SEARCH_RESULTS_RE.sub('(WEB SEARCH RESULTS OMITTED FROM LOG)', content)
                 # Sanitize brackets in user content to prevent formatting injection
-                content = content.replace('[', '(').replace(']', ')')
+                content = content.translate(helpers.BRACKET_TO_PAREN)
 
             buffer.append(f"[{role}]\n{content}\n\n")
         
@@ -203,13 +247,38 @@ def clear_channel_memory(channel_id, channel_name):
 
 # --- GOOD BOT LOGIC ---
 
+_GOOD_BOT_CACHE = None # user_id (str) -> {"user_id", "username", "count"}, mirrors user_scores
+
+def _get_good_bot_scores():
+    global _GOOD_BOT_CACHE
+    if _GOOD_BOT_CACHE is None:
+        rows = db.get_leaderboard()
+        if rows is None: return {} # Read failed: show nothing now, retry next time
+        _GOOD_BOT_CACHE = {row["user_id"]: row for row in rows}
+    return _GOOD_BOT_CACHE
+
 def increment_good_bot(user_id, username):
-    return db.increment_user_score(user_id, username)
+    """Writes through to the DB (still the source of truth) and keeps the cached scores in step."""
+    global _GOOD_BOT_CACHE
+    count = db.increment_user_score(user_id, username)
+    if not count:
+        _GOOD_BOT_CACHE = None # Write failed: re-read the table next time
+    elif _GOOD_BOT_CACHE is not None:
+        _GOOD_BOT_CACHE[str(user_id)] = {"user_id": str(user_id), "username": username, "count": count}
+    return count
 
 def get_good_bot_leaderboard():
-    return db.get_leaderboard()
+    """Returns all scores, highest first, from the memory cache."""
+    return sorted(_get_good_bot_scores().values(), key=itemgetter("count"), reverse=True)
+
+def get_good_bot_top(limit=10):
+    """Returns (top `limit` scores highest first, total count) without sorting the whole table."""
+    scores = _get_good_bot_scores().values()
+    return heapq.nlargest(limit, scores, key=itemgetter("count")), sum(map(itemgetter("count"), scores))
 
 def clear_good_bot_leaderboard():
+    global _GOOD_BOT_CACHE
+    _GOOD_BOT_CACHE = None
     return db.clear_user_scores()
 
 # --- EMBED SUPPRESSION LOGIC ---
@@ -1,7 +1,6 @@
 import discord
 import re
 import asyncio
-import base64
 import logging
 import config
 import helpers
@@ -115,7 +114,7 @@ async def process_message(client, message):
             now = discord.utils.utcnow().timestamp()
             last_time = client.good_bot_cooldowns.get(sender_id, 0)
             
-            if now - last_time > 5:
+            if now - last_time > config.GOOD_BOT_COOLDOWN_SECONDS:
                 formatted_name = f"{real_name} (@{message.author.name})"
                 if is_pk_proxy and system_name:
                     formatted_name = f"{system_name} ({real_name}, @{message.author.name})"
@@ -129,15 +128,11 @@ async def process_message(client, message):
                 
                 if target_message_id and target_message_id in client.active_views:
                     view = client.active_views[target_message_id]
-                    updated = False
-                    for child in view.children:
-                        if getattr(child, "custom_id", "") == "good_bot_btn":
-                            if not child.disabled:
-                                child.disabled = True
-                                child.style = discord.ButtonStyle.secondary
-                                child.label = f"Good Bot: {count}"
-                                updated = True
-                    if updated:
+                    child = ui.find_button(view, "good_bot_btn")
+                    if child and not child.disabled:
+                        child.disabled = True
+                        child.style = discord.ButtonStyle.secondary
+                        child.label = f"Good Bot: {count}"
                         try:
                             if message.reference and message.reference.message_id == target_message_id and message.reference.resolved:
                                 ref_msg = message.reference.resolved
@@ -174,8 +169,8 @@ async def process_message(client, message):
 
         if message.channel.id not in client.boot_cleared_channels:
             logger.info(f"🧹 First message in #{message.channel.name} since boot. Wiping memory.")
-            memory_manager.clear_channel_memory(message.channel.id, message.channel.name)
             client.boot_cleared_channels.add(message.channel.id)
+            await asyncio.to_thread(memory_manager.clear_channel_memory, message.channel.id, message.channel.name)
 
         client.processing_locks.add(message.id)
         logger.info(f"Processing Message from {message.author.name} (ID: {message.id})")
@@ -185,18 +180,15 @@ async def process_message(client, message):
             if message.attachments:
                 for att in message.attachments:
                     safe_mime = helpers.get_safe_mime_type(att)
-                    if safe_mime.startswith('image/') and att.size < 8 * 1024 * 1024:
+                    if safe_mime.startswith('image/') and att.size < helpers.MAX_INLINE_IMAGE_BYTES:
                         try:
-                            img_bytes = await att.read()
-                            b64_str = base64.b64encode(img_bytes).decode('utf-8')
-                            image_data_uri = f"data:{safe_mime};base64,{b64_str}"
+                            image_data_uri = await helpers.get_image_data_uri(att, safe_mime)
                             break
                         except Exception as e: logger.warning(f"⚠️ Error processing image: {e}")
 
-            clean_prompt = re.sub(r'<@!?{}>'.format(client.user.id), '', message.content)
-            for rid in config.BOT_ROLE_IDS: clean_prompt = re.sub(r'<@&{}>'.format(rid), '', clean_prompt)
-            clean_prompt = clean_prompt.replace(f"@{client.user.display_name}", "").replace(f"@{client.user.name}", "")
-            clean_prompt = clean_prompt.strip().replace("? ?", "?").replace("! ?", "!?").replace('[', '(').replace(']', ')')
+            bot_names = (client.user.display_name, client.user.name)
+            clean_prompt = helpers.strip_bot_mentions(message.content, client.user.id, config.BOT_ROLE_IDS, bot_names)
+            clean_prompt = clean_prompt.strip().replace("? ?", "?").replace("! ?", "!?").translate(helpers.BRACKET_TO_PAREN)
 
             force_search = False
             if "&web" in clean_prompt:
@@ -229,7 +221,7 @@ async def process_message(client, message):
             # Identity Suffix uses new Config logic
             identity_suffix = helpers.get_identity_suffix(sender_id, system_id, clean_name, services.service.my_system_members)
 
-            memory_manager.log_conversation(message.channel.name, real_name, sender_id or "UNKNOWN_ID", clean_prompt)
+            memory_manager.queue_log_conversation(message.channel.name, real_name, sender_id or "UNKNOWN_ID", clean_prompt)
 
             # History
             history_messages = []
@@ -255,8 +247,7 @@ async def process_message(client, message):
                 has_image_history = any(att.content_type and att.content_type.startswith('image/') for att in prev_msg.attachments)
                 if not p_content and not has_image_history: continue
                 
-                p_content = p_content.replace(f"@{client.user.display_name}", "").replace(f"@{client.user.name}", "")
-                p_content = re.sub(r'<@!?{}>'.format(client.user.id), '', p_content).strip().replace('[', '(').replace(']', ')')
+                p_content = helpers.strip_bot_mentions(p_content, client.user.id, names=bot_names).strip().translate(helpers.BRACKET_TO_PAREN)
 
                 current_msg_content = []
                 if p_content: current_msg_content.append({"type": "text", "text": p_content})
@@ -292,11 +283,8 @@ async def process_message(client, message):
 
             search_context = None
             if search_queries:
-                search_results_text = ""
-                for q in search_queries:
-                    results = await services.service.search_kagi(q)
-                    search_results_text += f"Query: {q}\n{results}\n\n"
-                search_context = search_results_text
+                results_list = await services.service.search_kagi_many(search_queries)
+                search_context = "".join(f"Query: {q}\n{results}\n\n" for q, results in zip(search_queries, results_list))
 
             if not clean_prompt and image_data_uri: clean_prompt = "What is this image?"
             elif not clean_prompt and not search_queries:
@@ -322,7 +310,7 @@ async def process_message(client, message):
             response_text = helpers.sanitize_llm_response(response_text)
             
             # 2. Log processed text
-            memory_manager.log_conversation(message.channel.name, "NyxOS", client.user.id, response_text)
+            memory_manager.queue_log_conversation(message.channel.name, "NyxOS", client.user.id, response_text)
             
             # 3. Restore formatting for Discord display
             response_text = helpers.restore_hyperlinks(response_text)
@@ -334,10 +322,10 @@ async def process_message(client, message):
                 prev_msg_id = client.last_bot_message_id.get(message.channel.id)
                 if prev_msg_id and prev_msg_id in client.active_views:
                     prev_view = client.active_views[prev_msg_id]
-                    for child in prev_view.children:
-                        if getattr(child, "custom_id", "") == "good_bot_btn":
-                            child.disabled = True
-                            child.label = "Good Bot!"
+                    child = ui.find_button(prev_view, "good_bot_btn")
+                    if child:
+                        child.disabled = True
+                        child.label = "Good Bot!"
                     try:
                         old_msg = await message.channel.fetch_message(prev_msg_id)
                         await old_msg.edit(view=prev_view)
@@ -353,7 +341,7 @@ async def process_message(client, message):
                 
                 if sent_message:
                     client.active_views[sent_message.id] = view
-                    client.last_bot_message_id[message.channel.id] = sent_message.id
+                    client._update_lru_cache(client.last_bot_message_id, message.channel.id, sent_message.id, limit=500)
                     
                     # --- SAVE VIEW STATE FOR PERSISTENCE ---
                     view_data = {
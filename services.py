@@ -1,9 +1,13 @@
 import aiohttp
 import re
 import os
-import json
+import sys
+import orjson
 import asyncio
+import time
 from datetime import datetime
+from itertools import dropwhile, groupby
+from operator import itemgetter
 import config
 import helpers
 import memory_manager
@@ -14,22 +18,118 @@ import vector_store
 
 logger = logging.getLogger("Services")
 
+# List markers the LLM puts in front of generated search queries ("1. ", "- ", "* ")
+QUERY_PREFIX_RE = re.compile(r'^\d+\.\s*|[-*]\s*')
+
+# {{PLACEHOLDER}} sentinels filled into the system prompt in a single pass
+PROMPT_PLACEHOLDER_RE = re.compile(r'\{\{(USER_NAME|Seraphim|CONTEXT|CURRENT_WEEKDAY|CURRENT_DATETIME)\}\}')
+
+_MISSING = object()
+_PK_ERROR = object() # Lookup failed (timeout, 5xx...), as opposed to PK answering "not found"
+
+def _merge_group(role, group):
+    """Coalesces consecutive same-role messages into one multi-part message, text separated by a newline."""
+    if len(group) == 1: return group[0]
+    parts = []
+    for i, msg in enumerate(group):
+        if i:
+            # New dicts for touched parts: the originals belong to the caller's history
+            if parts and parts[-1]['type'] == 'text':
+                parts[-1] = {"type": "text", "text": parts[-1]['text'] + "\n"}
+            else:
+                parts.append({"type": "text", "text": "\n"})
+        content = msg['content']
+        if isinstance(content, str):
+            parts.append({"type": "text", "text": content})
+        else:
+            parts.extend(content)
+    return {"role": role, "content": parts}
+
+def _is_startup_message(msg):
+    """True for the bot's own "back online" announcement, which shouldn't be fed back to the LLM."""
+    content = msg.get('content')
+    if not content: return False
+    if isinstance(content, str): return "I'm back online! Hi!" in content
+    return any("I'm back online! Hi!" in item.get('text', '') for item in content)
+
+def _has_brackets(text):
+    return '[' in text or ']' in text
+
+def _text_only(msg):
+    """Same message with image parts dropped (for the no-vision retry); string content is shared, not copied."""
+    content = msg['content']
+    if isinstance(content, str): return msg
+    text = " ".join(item['text'] for item in content if item['type'] == 'text')
+    if any(item['type'] == 'image_url' for item in content):
+        text += " (Image Download Failed)"
+    return {"role": msg['role'], "content": text}
+
+class ExpiringLRU:
+    """Size-bounded LRU whose entries also expire a fixed number of seconds after being stored."""
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict() # key -> (expires_at, value)
+
+    def get(self, key, default=None):
+        entry = self._data.get(key)
+        if entry is None: return default
+        if entry[0] <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def set(self, key, value, ttl=None):
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def pop(self, key, default=None):
+        entry = self._data.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        self._data.clear()
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def __len__(self):
+        return len(self._data)
+
 class APIService:
+    PK_CACHE_TTL = 3600   # System data changes rarely, but does change
+    PK_NEGATIVE_TTL = 300 # "No system" results: re-check soon in case they register
+    PK_ERROR_TTL = 30     # Failed lookups: back off briefly instead of retrying on every message
+
     def __init__(self):
         self.http_session = None
         self.db_pool = None
-        self.pk_user_cache = OrderedDict()   
+        self.MAX_CACHE_SIZE = 500
+        self.pk_user_cache = ExpiringLRU(self.MAX_CACHE_SIZE, self.PK_CACHE_TTL)
         self.pk_message_cache = OrderedDict()
-        self.pk_proxy_tags = OrderedDict()   
+        self.pk_proxy_tags = ExpiringLRU(self.MAX_CACHE_SIZE, self.PK_CACHE_TTL)
+        self.pk_inflight = {} # (kind, id) -> task of the fetch currently running for it
         self.proxy_tags_cache = [] # Combined list of ALL system tags + hardcoded
+        self.proxy_tag_pairs = () # proxy_tags_cache compiled for helpers.matches_proxy_tag
         self.proxy_tags_file = os.path.join(config.BASE_DIR, 'proxy_tags.json')
         self.my_system_members = set()  
         self.limiter = rate_limiter.limiter 
-        self.MAX_CACHE_SIZE = 500
+        self.kagi_semaphore = asyncio.Semaphore(3) # Concurrent Kagi requests allowed
+        self.kagi_timeout = aiohttp.ClientTimeout(total=10, connect=3)
 
     async def start(self):
-        timeout = aiohttp.ClientTimeout(total=60)
-        self.http_session = aiohttp.ClientSession(timeout=timeout)
+        # Explicit pool instead of the defaults: a per-host cap so one slow endpoint (LM Studio, PK, Kagi)
+        # can't take every connection, cached DNS, and idle keep-alive connections kept for reuse
+        connector = aiohttp.TCPConnector(limit=64, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=75)
+        timeout = aiohttp.ClientTimeout(total=60, connect=5)
+        # json= bodies (LM Studio payloads carry base64 images) are encoded by orjson
+        self.http_session = aiohttp.ClientSession(timeout=timeout, connector=connector, json_serialize=lambda obj: orjson.dumps(obj).decode())
         
         self.load_proxy_tags_from_disk()
         
@@ -61,8 +161,8 @@ class APIService:
         loaded_tags = []
         if os.path.exists(self.proxy_tags_file):
             try:
-                with open(self.proxy_tags_file, 'r', encoding='utf-8') as f:
-                    loaded_tags = json.load(f)
+                with open(self.proxy_tags_file, 'rb') as f:
+                    loaded_tags = orjson.loads(f.read())
                 logger.info(f"Loaded {len(loaded_tags)} proxy tags from disk.")
             except Exception as e:
                 logger.error(f"Failed to load proxy tags from disk: {e}")
@@ -72,9 +172,8 @@ class APIService:
         hardcoded = config.HARDCODED_PROXY_TAGS if hasattr(config, 'HARDCODED_PROXY_TAGS') else []
         
         # Structure of tags: {'prefix': 'x', 'suffix': 'y'}
-        # Hardcoded are simple strings (prefixes). Convert to dict format for consistency?
-        # Actually, `matches_proxy_tag` handles dicts.
-        # Let's standardize: `proxy_tags_cache` is a list of dicts.
+        # Hardcoded are simple strings (prefixes), converted to the same dict format.
+        # `proxy_tags_cache` is a list of dicts; `proxy_tag_pairs` is what matching uses.
         
         final_list = []
         seen = set()
@@ -95,10 +194,11 @@ class APIService:
                 seen.add(sig)
                 
         self.proxy_tags_cache = final_list
+        self.proxy_tag_pairs = helpers.compile_proxy_tags(final_list)
 
     def get_all_proxy_tags(self):
-        """Returns the full cached list of proxy tags to ignore."""
-        return self.proxy_tags_cache
+        """Returns all proxy tags to ignore, compiled for helpers.matches_proxy_tag."""
+        return self.proxy_tag_pairs
 
     async def update_proxy_tags_cache(self, system_id=None):
         """Fetches ALL proxy tags for the system and updates the cache/file."""
@@ -111,7 +211,7 @@ class APIService:
         try:
             async with self.http_session.get(url) as resp:
                 if resp.status == 200:
-                    members = await resp.json()
+                    members = await resp.json(loads=orjson.loads)
                     for m in members:
                         ptags = m.get('proxy_tags', [])
                         for pt in ptags:
@@ -125,8 +225,8 @@ class APIService:
 
         # Save to Disk
         try:
-            with open(self.proxy_tags_file, 'w', encoding='utf-8') as f:
-                json.dump(fetched_tags, f, indent=2)
+            with open(self.proxy_tags_file, 'wb') as f:
+                f.write(orjson.dumps(fetched_tags, option=orjson.OPT_INDENT_2))
         except Exception as e:
             return False, f"Failed to write file: {e}"
 
@@ -161,10 +261,11 @@ class APIService:
                 async def fetch_members(target_url):
                     async with self.http_session.get(target_url) as resp:
                         if resp.status == 200:
-                            members = await resp.json()
+                            members = await resp.json(loads=orjson.loads)
+                            # Interned: these are matched against every message's member name
                             for m in members:
-                                if 'name' in m: self.my_system_members.add(m['name'])
-                                if 'display_name' in m and m['display_name']: self.my_system_members.add(m['display_name'])
+                                if 'name' in m: self.my_system_members.add(sys.intern(m['name']))
+                                if 'display_name' in m and m['display_name']: self.my_system_members.add(sys.intern(m['display_name']))
                             return True
                         return False
 
@@ -194,27 +295,35 @@ class APIService:
         data = await self.get_pk_user_data(user_id)
         return data is not None
 
+    async def _coalesced(self, key, fetch):
+        """Concurrent lookups of the same key share one in-flight fetch instead of each hitting PK."""
+        task = self.pk_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self.pk_inflight[key] = task
+            task.add_done_callback(lambda _: self.pk_inflight.pop(key, None))
+        # Shielded: one waiter being cancelled must not cancel the fetch the others are waiting on
+        return await asyncio.shield(task)
+
     async def _fetch_pk_user_api(self, url, user_id):
-        """Helper to fetch user data from a specific PK API URL."""
+        """Helper to fetch user data from a specific PK API URL. None = not found, _PK_ERROR = lookup failed."""
         try:
             async with self.http_session.get(url) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = await resp.json(loads=orjson.loads)
                     result = {'system_id': data.get('id'), 'tag': data.get('tag')}
                     
                     # Cache Success
-                    self.pk_user_cache[user_id] = result
-                    if len(self.pk_user_cache) > self.MAX_CACHE_SIZE:
-                        self.pk_user_cache.popitem(last=False)
+                    self.pk_user_cache.set(user_id, result)
                     return result
                 elif resp.status == 404:
                     return None # Not found here
                 else:
                     logger.warning(f"PK User API Error {resp.status} from {url}")
-                    return None
+                    return _PK_ERROR
         except Exception as e:
             logger.warning(f"PK User API Exception for {url}: {e}")
-            return None
+            return _PK_ERROR
 
     async def get_pk_user_data(self, user_id):
         # 1. Try DB if Local
@@ -230,67 +339,65 @@ class APIService:
                     if row:
                         result = {'system_id': row['hid'], 'tag': row['tag']}
                         
-                        # Cache Logic
-                        if user_id in self.pk_user_cache:
-                            self.pk_user_cache.move_to_end(user_id)
-                        else:
-                            self.pk_user_cache[user_id] = result
-                            if len(self.pk_user_cache) > self.MAX_CACHE_SIZE:
-                                self.pk_user_cache.popitem(last=False)
-                                
+                        self.pk_user_cache.set(user_id, result)
                         return result
             except Exception as e:
                 logger.error(f"PK DB User Lookup Error: {e}")
 
         # 2. Check Cache
-        if user_id in self.pk_user_cache:
-            self.pk_user_cache.move_to_end(user_id)
-            return self.pk_user_cache[user_id]
+        cached = self.pk_user_cache.get(user_id, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
+        return await self._coalesced(("user", user_id), lambda: self._lookup_pk_user(user_id))
 
+    async def _lookup_pk_user(self, user_id):
         # 3. Try Configured API
         url = config.PLURALKIT_USER_API.format(user_id)
         result = await self._fetch_pk_user_api(url, user_id)
         
         # 4. Fallback to Official API
         # If result is None (404 or Error) AND we are using Local PK, try Official
-        if result is None and config.USE_LOCAL_PLURALKIT:
+        if (result is None or result is _PK_ERROR) and config.USE_LOCAL_PLURALKIT:
              # We can't easily distinguish 404 (User doesn't exist) vs 404 (User not in Local Mirror).
              # So we try Official just in case.
              logger.info(f"Local PK User lookup failed for {user_id}. Trying Official API...")
              official_url = f"https://api.pluralkit.me/v2/users/{user_id}"
              result = await self._fetch_pk_user_api(official_url, user_id)
 
-        # Cache the final None result if we really found nothing (to prevent spamming)
+        # Cache the final None result (to prevent spamming): a real "not found" for a few minutes,
+        # a failed lookup only briefly so the user isn't treated as system-less for long
+        if result is _PK_ERROR:
+             self.pk_user_cache.set(user_id, None, ttl=self.PK_ERROR_TTL)
+             return None
         if result is None:
-             self.pk_user_cache[user_id] = None
-             if len(self.pk_user_cache) > self.MAX_CACHE_SIZE:
-                  self.pk_user_cache.popitem(last=False)
+             self.pk_user_cache.set(user_id, None, ttl=self.PK_NEGATIVE_TTL)
         
         return result
 
     async def get_system_proxy_tags(self, system_id):
-        if system_id in self.pk_proxy_tags:
-            self.pk_proxy_tags.move_to_end(system_id)
-            return self.pk_proxy_tags[system_id]
+        cached = self.pk_proxy_tags.get(system_id)
+        if cached is not None:
+            return cached
+        return await self._coalesced(("tags", system_id), lambda: self._fetch_system_proxy_tags(system_id))
 
+    async def _fetch_system_proxy_tags(self, system_id):
         url = config.PLURALKIT_SYSTEM_MEMBERS.format(system_id)
-        tags = []
         try:
             async with self.http_session.get(url) as resp:
                 if resp.status == 200:
-                    members = await resp.json()
-                    for m in members:
-                        ptags = m.get('proxy_tags', [])
-                        for pt in ptags:
-                            tags.append({'prefix': pt.get('prefix'), 'suffix': pt.get('suffix')})
-                    
-                    self.pk_proxy_tags[system_id] = tags
-                    if len(self.pk_proxy_tags) > self.MAX_CACHE_SIZE:
-                        self.pk_proxy_tags.popitem(last=False)
-                        
+                    members = await resp.json(loads=orjson.loads)
+                    # Compiled once here rather than re-stripping every tag on every matches_proxy_tag call
+                    tags = helpers.compile_proxy_tags(pt for m in members for pt in m.get('proxy_tags', []))
+                    self.pk_proxy_tags.set(system_id, tags)
+                    return tags
+                # 404 / private member list: nothing to match for a while. Anything else: retry soon.
+                ttl = self.PK_NEGATIVE_TTL if resp.status in (403, 404) else self.PK_ERROR_TTL
         except Exception as e:
             logger.warning(f"Error fetching proxy tags: {e}")
-        return tags
+            ttl = self.PK_ERROR_TTL
+        self.pk_proxy_tags.set(system_id, (), ttl=ttl)
+        return ()
 
     async def _fetch_pk_message_api(self, url, message_id):
         """Helper to fetch message data from a specific PK API URL."""
@@ -298,7 +405,7 @@ class APIService:
             try:
                 async with self.http_session.get(url) as resp:
                     if resp.status == 200:
-                        data = await resp.json()
+                        data = await resp.json(loads=orjson.loads)
                         member_name = data.get('member', {}).get('name')
                         member_display = data.get('member', {}).get('display_name')
                         final_name = member_display if member_display else member_name
@@ -310,8 +417,6 @@ class APIService:
                         sender_id = data.get('sender') 
                         
                         description = data.get('member', {}).get('description', "")
-                        if description:
-                            description = description.replace('[', '(').replace(']', ')')
                         
                         result = (final_name, system_id, system_name, system_tag, sender_id, description)
                         
@@ -364,7 +469,6 @@ class APIService:
                     if row:
                         final_name = row['display_name'] if row['display_name'] else row['name']
                         desc = row['description']
-                        if desc: desc = desc.replace('[', '(').replace(']', ')')
                         
                         result = (
                             final_name, 
@@ -442,14 +546,14 @@ class APIService:
         try:
             async with self.http_session.post(config.LM_STUDIO_URL, json=payload) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = await resp.json(loads=orjson.loads)
                     content = data['choices'][0]['message']['content'].strip()
                     if "NO_SEARCH" in content and not force_search: return []
                     queries = [q.strip() for q in content.split('\n') if q.strip()]
                     clean_queries = []
                     for q in queries:
                         # Remove numbers, dashes, or asterisks at start
-                        q = re.sub(r'^\d+\.\s*|[-*]\s*', '', q).strip()
+                        q = QUERY_PREFIX_RE.sub('', q).strip()
                         # Remove &web if LLM hallucinates it back in
                         q = q.replace("&web", "").strip()
                         if q.lower() != user_prompt.lower(): clean_queries.append(q)
@@ -467,22 +571,26 @@ class APIService:
         headers = {"Authorization": f"Bot {config.KAGI_API_TOKEN}"}
         params = {"q": query, "limit": 6} 
         try:
-            async with self.http_session.get(config.KAGI_SEARCH_URL, headers=headers, params=params) as resp:
+            async with self.kagi_semaphore, self.http_session.get(config.KAGI_SEARCH_URL, headers=headers, params=params, timeout=self.kagi_timeout) as resp:
                 if resp.status == 200:
-                    data = await resp.json()
+                    data = await resp.json(loads=orjson.loads)
                     results = data.get("data", [])
                     if not results: return "No results found."
-                    summary = ""
+                    parts = []
                     for i, item in enumerate(results, 1):
                         title = item.get("title", "No Title")
                         snippet = item.get("snippet", "No Snippet")
                         if len(snippet) > 350: snippet = snippet[:350] + "..."
                         url = item.get("url", "#")
-                        summary += f"{i}. [{title}]({url})\n   {snippet}\n\n"
-                    return summary
+                        parts.append(f"{i}. [{title}]({url})\n   {snippet}\n\n")
+                    return "".join(parts)
                 else: return f"Error: Kagi API returned status {resp.status}"
         except Exception as e: return f"Error searching Kagi: {e}"
 
+    async def search_kagi_many(self, queries):
+        """Runs the searches concurrently (at most 3 in flight); results are in query order."""
+        return await asyncio.gather(*(self.search_kagi(q) for q in queries))
+
     # --- YOUTUBE TRANSCRIPTS ---
 
     def extract_video_id(self, url):
@@ -620,12 +728,14 @@ class APIService:
             # Check if prompt uses time placeholders
             has_time_placeholder = "{{CURRENT_DATETIME}}" in raw_system_prompt
             
-            base_prompt = raw_system_prompt \
-                .replace("{{USER_NAME}}", "the people in this chatroom") \
-                .replace("{{Seraphim}}", "Seraphim") \
-                .replace("{{CONTEXT}}", "") \
-                .replace("{{CURRENT_WEEKDAY}}", datetime.now().strftime("%A")) \
-                .replace("{{CURRENT_DATETIME}}", f"{date_str}, {time_str}")
+            placeholders = {
+                "USER_NAME": "the people in this chatroom",
+                "Seraphim": "Seraphim",
+                "CONTEXT": "",
+                "CURRENT_WEEKDAY": datetime.now().strftime("%A"),
+                "CURRENT_DATETIME": f"{date_str}, {time_str}",
+            }
+            base_prompt = PROMPT_PLACEHOLDER_RE.sub(lambda m: placeholders[m.group(1)], raw_system_prompt)
 
             # Only prepend header if the user didn't use the placeholder
             if not has_time_placeholder:
@@ -633,8 +743,7 @@ class APIService:
                  base_prompt = time_header + base_prompt
                 
             if member_description:
-                clean_desc = member_description.replace('[', '(').replace(']', ')')
-                base_prompt += f"\n\n(Context: The user '{username}' has the following description: {clean_desc})"
+                base_prompt += f"\n\n(Context: The user '{username}' has the following description: {member_description})"
 
             if vector_context:
                 base_prompt += vector_context
@@ -666,17 +775,11 @@ class APIService:
         raw_messages = [{"role": "system", "content": formatted_system_prompt}]
         
         # --- HISTORY CLEANUP ---
-        cleaned_history = []
-        for i, msg in enumerate(history_messages):
-            content_str = str(msg.get('content', ''))
-            if "I'm back online! Hi!" in content_str: continue
-            
-            cleaned_history.append(msg)
+        # One lazy pass over the caller's dicts: no intermediate list, no str() of multi-part content
+        cleaned_history = (msg for msg in history_messages if not _is_startup_message(msg))
         
-        while len(cleaned_history) > 0 and cleaned_history[0].get('role') == 'assistant':
-            cleaned_history.pop(0)
-            
-        raw_messages.extend(cleaned_history)
+        # History must not open with the assistant
+        raw_messages.extend(dropwhile(lambda msg: msg.get('role') == 'assistant', cleaned_history))
 
         user_text_content = f"{display_name_for_ai}{reply_context_str} says: {user_prompt}"
         
@@ -691,34 +794,17 @@ class APIService:
         raw_messages.append({"role": "user", "content": current_message_content})
 
         # === COALESCE LOGIC ===
+        # The text-only mirror is built alongside, so a vision failure can retry without rescanning
         merged_messages = []
-        for msg in raw_messages:
-            if not merged_messages:
-                merged_messages.append(msg)
-                continue
-            
-            last_msg = merged_messages[-1]
-            
-            if last_msg['role'] == msg['role']:
-                if isinstance(last_msg['content'], str):
-                    last_msg['content'] = [{"type": "text", "text": last_msg['content']}]
-                
-                current_list = msg['content']
-                if isinstance(current_list, str):
-                    current_list = [{"type": "text", "text": current_list}]
-                
-                # Insert a newline separator before appending new content
-                if last_msg['content'] and last_msg['content'][-1]['type'] == 'text':
-                    last_msg['content'][-1]['text'] += "\n"
-                else:
-                    last_msg['content'].append({"type": "text", "text": "\n"})
-
-                last_msg['content'].extend(current_list)
-            else:
-                merged_messages.append(msg)
+        text_only_messages = []
+        for role, group in groupby(raw_messages, key=itemgetter('role')):
+            merged = _merge_group(role, list(group))
+            merged_messages.append(merged)
+            text_only_messages.append(_text_only(merged))
 
         if len(merged_messages) > 1 and merged_messages[1]['role'] == 'assistant':
             merged_messages.pop(1)
+            text_only_messages.pop(1)
 
         # Log to Memory Buffer
         await memory_manager.write_context_buffer(merged_messages, channel_obj.id, channel_obj.name)
@@ -728,30 +814,27 @@ class APIService:
         except Exception as e:
             if "400" in str(e) or "base64" in str(e).lower():
                 logger.error(f"Vision Payload Failed. Error: {e}. Retrying request without images...")
-                text_only_messages = self._strip_images(merged_messages)
                 return await self._send_payload(text_only_messages)
             raise e
 
     async def _send_payload(self, messages):
         headers = {"Content-Type": "application/json"}
         
+        # Single sanitization point for everything sent to the LLM.
+        # Most text was already cleaned upstream, so only messages that still hold a bracket are copied.
         cleaned_messages = []
         for msg in messages:
-            new_msg = msg.copy()
-            content = new_msg.get('content')
-            
+            content = msg.get('content')
             if isinstance(content, str):
-                new_msg['content'] = content.replace('[', '(').replace(']', ')')
+                if _has_brackets(content):
+                    msg = {**msg, 'content': content.translate(helpers.BRACKET_TO_PAREN)}
             elif isinstance(content, list):
-                new_list = []
-                for item in content:
-                    new_item = item.copy()
-                    if new_item.get('type') == 'text':
-                        new_item['text'] = new_item['text'].replace('[', '(').replace(']', ')')
-                    new_list.append(new_item)
-                new_msg['content'] = new_list
-                
-            cleaned_messages.append(new_msg)
+                if any(item.get('type') == 'text' and _has_brackets(item['text']) for item in content):
+                    msg = {**msg, 'content': [
+                        {**item, 'text': item['text'].translate(helpers.BRACKET_TO_PAREN)} if item.get('type') == 'text' else item
+                        for item in content
+                    ]}
+            cleaned_messages.append(msg)
         
         payload = {
             "messages": cleaned_messages,
@@ -765,7 +848,7 @@ class APIService:
 
         async with self.http_session.post(config.LM_STUDIO_URL, json=payload, headers=headers) as resp:
             if resp.status == 200:
-                data = await resp.json()
+                data = await resp.json(loads=orjson.loads)
                 content = data['choices'][0]['message']['content']
                 # Strip ALL '#' characters as requested to prevent markdown header issues
                 # REMOVED: This breaks URL anchors. Handled in helpers.sanitize_llm_response instead.
@@ -775,20 +858,6 @@ class APIService:
                 logger.error(f"LM Studio Error ({resp.status}): {error_text}")
                 raise Exception(f"LM Studio Error {resp.status}: {error_text}")
 
-    def _strip_images(self, messages):
-        clean_messages = []
-        for msg in messages:
-            content = msg['content']
-            if isinstance(content, list):
-                text_parts = [item['text'] for item in content if item['type'] == 'text']
-                new_content = " ".join(text_parts)
-                if any(item['type'] == 'image_url' for item in content):
-                    new_content += " (Image Download Failed)"
-                clean_messages.append({"role": msg['role'], "content": new_content})
-            else:
-                clean_messages.append(msg)
-        return clean_messages
-
     async def get_chat_response(self, messages):
         """
         Simplified wrapper for direct chat completions (e.g., used by Backup Manager).
@@ -84,12 +84,16 @@ class TestCommandHandler:
              patch('builtins.open', m_open), \
              patch('command_handler.os.execl') as mock_exec, \
              patch('command_handler.sys.executable', 'python'), \
-             patch('command_handler.os.fsync'):
+             patch('command_handler.os.fsync'), \
+             patch('helpers.os.replace') as mock_replace:
             
             await command_handler.handle_prefix_command(mock_client, mock_message)
             
-            # Verify Write to RESTART_META_FILE
-            m_open.assert_called_with(config.RESTART_META_FILE, "w")
+            # Verify Write to RESTART_META_FILE (temp file swapped into place)
+            tmp_path = m_open.call_args[0][0]
+            assert tmp_path.startswith(config.RESTART_META_FILE + ".tmp")
+            m_open().write.assert_called_with('{"channel_id": 123}')
+            mock_replace.assert_called_once_with(tmp_path, config.RESTART_META_FILE)
             
             # Verify Execution
             mock_exec.assert_called()
@@ -39,6 +39,7 @@ class TestGoodBot(unittest.IsolatedAsyncioTestCase):
         # Volition
         mock_client.volition = MagicMock()
         mock_client.volition.update_buffer = AsyncMock()
+        mock_client.history_cache.remember = MagicMock()
         
         # Emotional Core (Sync)
         mock_client.emotional_core = MagicMock()
@@ -101,6 +102,7 @@ class TestGoodBot(unittest.IsolatedAsyncioTestCase):
         # Volition
         mock_client.volition = MagicMock()
         mock_client.volition.update_buffer = AsyncMock()
+        mock_client.history_cache.remember = MagicMock()
         
         # Emotional Core (Sync)
         mock_client.emotional_core = MagicMock()
@@ -1,11 +1,15 @@
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, AsyncMock
 from helpers import (
     get_safe_mime_type,
     matches_proxy_tag,
+    compile_proxy_tags,
     clean_name_logic,
     sanitize_llm_response,
-    restore_hyperlinks
+    restore_hyperlinks,
+    atomic_write,
+    strip_bot_mentions,
+    get_image_data_uri
 )
 
 class TestHelpers:
@@ -49,11 +53,13 @@ class TestHelpers:
 
     def test_matches_proxy_tag(self):
         # Setup tags
-        tags = [
+        tags = compile_proxy_tags([
             {'prefix': 'Seraph:', 'suffix': ''},
             {'prefix': '', 'suffix': '-Chiara'},
-            {'prefix': '[', 'suffix': ']'}
-        ]
+            {'prefix': '[', 'suffix': ']'},
+            {'prefix': None, 'suffix': None}
+        ])
+        assert len(tags) == 3 # Empty tag dropped
 
         # Test Matches
         assert matches_proxy_tag("Seraph: Hello", tags) is True
@@ -119,3 +125,24 @@ class TestHelpers:
         # Test 4: Mixed
         text = "Check (This)(https://link.com) out."
         assert restore_hyperlinks(text) == "Check [This](https://link.com) out."
+
+    def test_atomic_write(self, tmp_path):
+        target = tmp_path / "meta.json"
+        target.write_text("old")
+        atomic_write(str(target), '{"channel_id": 1}')
+        assert target.read_text() == '{"channel_id": 1}'
+        assert [p.name for p in tmp_path.iterdir()] == ["meta.json"] # Temp file was moved, not left behind
+
+    def test_strip_bot_mentions(self):
+        text = "<@123> hi <@!123> and <@&555>, not <@456> or <@&777>"
+        assert strip_bot_mentions(text, 123, [555]) == " hi  and , not <@456> or <@&777>"
+        # Without role IDs only the user mention is removed
+        assert strip_bot_mentions("<@123><@&555>", 123) == "<@&555>"
+        # Plain "@name" references go in the same pass, longest name first
+        assert strip_bot_mentions("@NyxOS hi @Nyx <@123>", 123, names=("Nyx", "NyxOS")) == " hi  "
+
+    @pytest.mark.asyncio
+    async def test_get_image_data_uri(self):
+        att = MagicMock()
+        att.read = AsyncMock(return_value=b"png")
+        assert await get_image_data_uri(att, "image/png") == "data:image/png;base64,cG5n"
@@ -0,0 +1,96 @@
+import pytest
+from unittest.mock import MagicMock, AsyncMock, patch
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import NyxOS
+
+class AsyncIterator:
+    def __init__(self, seq):
+        self.iter = iter(seq)
+    def __aiter__(self):
+        return self
+    async def __anext__(self):
+        try:
+            return next(self.iter)
+        except StopIteration:
+            raise StopAsyncIteration
+
+def make_msg(msg_id, channel):
+    msg = MagicMock()
+    msg.id = msg_id
+    msg.channel = channel
+    return msg
+
+class TestChannelHistoryCache:
+
+    @pytest.mark.asyncio
+    async def test_backfills_once_then_serves_from_memory(self):
+        channel = MagicMock()
+        channel.id = 1
+        older = [make_msg(i, channel) for i in (3, 2, 1)] # API order: newest first
+        channel.history = MagicMock(return_value=AsyncIterator(older))
+
+        cache = NyxOS.ChannelHistoryCache(maxlen=5)
+        first = make_msg(4, channel)
+        cache.remember(first)
+        assert [m.id for m in await cache.recent(first, 10)] == [3, 2, 1]
+        channel.history.assert_called_once_with(limit=5, before=first)
+
+        second = make_msg(5, channel)
+        cache.remember(second)
+        # Served from the ring buffer: no second API call, trimmed to the limit
+        assert [m.id for m in await cache.recent(second, 2)] == [4, 3]
+        channel.history.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_forget_and_bound(self):
+        channel = MagicMock()
+        channel.id = 1
+        channel.history = MagicMock(return_value=AsyncIterator([]))
+
+        cache = NyxOS.ChannelHistoryCache(maxlen=3)
+        msgs = [make_msg(i, channel) for i in range(1, 6)]
+        for m in msgs: cache.remember(m)
+        cache.forget(1, (3,))
+
+        # Only the newest 3 were kept, and the deleted one is gone
+        assert [m.id for m in await cache.recent(make_msg(6, channel), 10)] == [5, 4]
+
+    @pytest.mark.asyncio
+    async def test_edit_replaces_backfilled_message(self):
+        channel = MagicMock()
+        channel.id = 1
+        channel.history = MagicMock(return_value=AsyncIterator([make_msg(1, channel)]))
+
+        cache = NyxOS.ChannelHistoryCache(maxlen=5)
+        first = make_msg(2, channel)
+        cache.remember(first)
+        await cache.recent(first, 10)
+
+        edited = make_msg(1, channel)
+        cache.replace(edited)
+        assert (await cache.recent(make_msg(3, channel), 10))[-1] is edited
+
+class TestProxyTriggerCache:
+
+    @pytest.mark.asyncio
+    async def test_verdict_memoized_per_message_content(self):
+        bot = NyxOS.LMStudioBot()
+        msg = MagicMock()
+        msg.id = 10
+        msg.author.id = 5
+        msg.content = "nyx: hello"
+
+        with patch('services.service.get_system_proxy_tags', new_callable=AsyncMock, return_value=(("nyx:", ""),)) as mock_tags, \
+             patch('services.service.get_pk_user_data', new_callable=AsyncMock, return_value=None):
+            assert await bot.is_proxy_trigger_message(msg) is True
+            assert await bot.is_proxy_trigger_message(msg) is True
+            assert mock_tags.await_count == 1 # Second answer came from the cache
+
+            # An edit changes the content, so it is checked again
+            msg.content = "plain reply"
+            assert await bot.is_proxy_trigger_message(msg) is False
+            assert mock_tags.await_count == 2
@@ -69,6 +69,28 @@ class TestMemoryManager:
             assert "[ASSISTANT_REPLY]" in content_sent
             assert "I agree (with) you." in content_sent
 
+    def test_good_bot_leaderboard_cached(self):
+        mock_db = MagicMock()
+        mock_db.get_leaderboard.return_value = [{"user_id": "1", "username": "A", "count": 2}]
+        mock_db.increment_user_score.return_value = 3
+        with patch('memory_manager.db', mock_db), patch('memory_manager._GOOD_BOT_CACHE', None):
+            assert memory_manager.get_good_bot_leaderboard()[0]["count"] == 2
+            memory_manager.increment_good_bot("2", "B")
+            lb = memory_manager.get_good_bot_leaderboard()
+
+            # Table read once; the increment is written through and reflected from memory
+            mock_db.get_leaderboard.assert_called_once()
+            mock_db.increment_user_score.assert_called_once_with("2", "B")
+            assert [u["username"] for u in lb] == ["B", "A"]
+
+    def test_good_bot_leaderboard_not_cached_on_db_error(self):
+        mock_db = MagicMock()
+        mock_db.get_leaderboard.side_effect = [None, [{"user_id": "1", "username": "A", "count": 2}]]
+        with patch('memory_manager.db', mock_db), patch('memory_manager._GOOD_BOT_CACHE', None):
+            assert memory_manager.get_good_bot_leaderboard() == []
+            # The failed read was not cached, so the table is read again
+            assert memory_manager.get_good_bot_leaderboard()[0]["count"] == 2
+
     def test_log_conversation(self):
         # Mock datetime to have consistent timestamp
         mock_dt = MagicMock()
@@ -77,7 +99,8 @@ class TestMemoryManager:
         with patch('memory_manager.datetime', mock_dt), \
              patch('builtins.open', mock_open()) as mocked_file, \
              patch('os.makedirs') as mock_dirs, \
-             patch('os.path.exists', return_value=False): # Simulate new file
+             patch('os.path.exists', return_value=False), \
+             patch.dict('memory_manager._LOG_HANDLES', clear=True): # Simulate new file, no cached handles
             
             channel = "debug-logs"
             user = "Tester"
@@ -90,10 +113,9 @@ class TestMemoryManager:
             mock_dirs.assert_called()
             
             # Verify File Writes
-            # First write: Header (since we simulated file not exists)
-            # Second write: Log content
+            # One append handle: Header first (since we simulated file not exists), then Log content
             
-            assert mocked_file.call_count == 2
+            assert mocked_file.call_count == 1
             handle = mocked_file()
             
             # Check content of writes
@@ -103,3 +125,32 @@ class TestMemoryManager:
             # 2. Message
             handle.write.assert_any_call("[12:00:00] Tester [999]: Test Message\n")
 
+            # Same day + channel reuses the open handle
+            memory_manager.log_conversation(channel, user, uid, "Again")
+            assert mocked_file.call_count == 2 # Only the mocked_file() call above
+            handle.write.assert_any_call("[12:00:00] Tester [999]: Again\n")
+
+
+    def test_queue_log_conversation_uses_writer_thread(self):
+        import threading
+        seen = []
+        def fake_log(channel, user, uid, content, now=None):
+            seen.append((threading.current_thread().name, content, now))
+
+        with patch('memory_manager.log_conversation', side_effect=fake_log):
+            memory_manager.queue_log_conversation("chan", "Tester", "999", "first")
+            memory_manager.queue_log_conversation("chan", "Tester", "999", "second").result()
+
+        # Lines are written off the caller's thread, in the order they were queued, with the queue-time stamp
+        assert [content for _, content, _ in seen] == ["first", "second"]
+        assert all(name.startswith("nyx-log") for name, _, _ in seen)
+        assert all(now is not None for _, _, now in seen)
+
+    def test_good_bot_top(self):
+        scores = [{"user_id": str(i), "username": f"U{i}", "count": i} for i in range(1, 16)]
+        mock_db = MagicMock()
+        mock_db.get_leaderboard.return_value = scores
+        with patch('memory_manager.db', mock_db), patch('memory_manager._GOOD_BOT_CACHE', None):
+            top, total = memory_manager.get_good_bot_top(3)
+        assert [u["username"] for u in top] == ["U15", "U14", "U13"]
+        assert total == sum(range(1, 16))
@@ -0,0 +1,326 @@
+import unittest
+from unittest.mock import MagicMock, patch
+import sys
+import os
+import asyncio
+
+import orjson
+from aiohttp.test_utils import TestClient, TestServer
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import NyxAPI
+
+class TestNyxAPI(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.bot = MagicMock()
+        self.bot.latency = 0.0421
+        self.bot.user = MagicMock()
+        self.bot.user.id = 999
+        self.bot.user.__str__.return_value = "Nyx#0001"
+        self.temple_guild = MagicMock()
+        self.temple_guild.emojis = []
+        self.bot.get_guild.side_effect = lambda gid: self.temple_guild if gid == NyxAPI.config.TEMPLE_GUILD_ID else None
+        self.bot.active_bars = {}
+
+        self.api = NyxAPI.NyxAPI(self.bot)
+        self.api.api_key = "test-key"
+        self.client = TestClient(TestServer(self.api.app))
+        await self.client.start_server()
+        self.headers = {"x-api-key": "test-key"}
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def test_status_uses_orjson_body(self):
+        resp = await self.client.get("/api/status", headers=self.headers)
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(resp.content_type, "application/json")
+        data = orjson.loads(await resp.read())
+        self.assertEqual(data["id"], 999)
+        self.assertEqual(data["latency"], 42.1)
+        self.assertEqual(data["user"], "Nyx#0001")
+
+    def _make_emoji(self, name, emoji_id):
+        emoji = MagicMock()
+        emoji.name = name
+        emoji.id = emoji_id
+        emoji.animated = False
+        emoji.url = f"https://cdn.discordapp.com/emojis/{emoji_id}.png"
+        return emoji
+
+    async def test_emoji_list_is_cached_until_invalidated(self):
+        self.temple_guild.emojis = [self._make_emoji("Nyx", 1)]
+
+        with patch.object(NyxAPI, "EMOJI_DB_FILE", "/nonexistent/emoji_db.json"):
+            resp = await self.client.get("/api/emojis", headers=self.headers)
+            data = orjson.loads(await resp.read())
+            self.assertEqual([e["name"] for e in data["emojis"]], ["Nyx"])
+
+            # Cached: new Discord emojis are not visible until invalidation
+            self.temple_guild.emojis.append(self._make_emoji("Calyptra", 3))
+            resp = await self.client.get("/api/emojis", headers=self.headers)
+            self.assertEqual(orjson.loads(await resp.read())["count"], 1)
+
+            self.api.invalidate_emoji_cache()
+            resp = await self.client.get("/api/emojis", headers=self.headers)
+            data = orjson.loads(await resp.read())
+            self.assertEqual([e["name"] for e in data["emojis"]], ["Nyx", "Calyptra"])
+
+    async def test_local_emoji_file_priority(self):
+        import tempfile, json
+        with tempfile.TemporaryDirectory() as tmp:
+            img_dir = os.path.join(tmp, "emojis")
+            os.makedirs(img_dir)
+            for fname in ["Star.webp", "Star.png", "Moon.gif", "Orphan.png", "notes.txt"]:
+                open(os.path.join(img_dir, fname), "wb").close()
+            db_path = os.path.join(tmp, "emoji_db.json")
+            with open(db_path, "w") as f:
+                json.dump({"Star": "<:Star:1>", "Moon": "<a:Moon:2>", "Missing": "<:Missing:3>"}, f)
+
+            with patch.object(NyxAPI, "EMOJI_DB_FILE", db_path), patch.object(NyxAPI, "EMOJI_IMG_DIR", img_dir):
+                resp = await self.client.get("/api/emojis", headers=self.headers)
+                data = orjson.loads(await resp.read())
+
+        by_name = {e["name"]: e for e in data["emojis"]}
+        self.assertEqual(set(by_name), {"Star", "Moon"})
+        self.assertEqual(by_name["Star"]["url"], "/emojis/Star.png")
+        self.assertTrue(by_name["Moon"]["animated"])
+
+    async def test_palette_saves_are_coalesced(self):
+        import tempfile, json
+        with tempfile.TemporaryDirectory() as tmp:
+            palette_path = os.path.join(tmp, "palette_layout.json")
+            with patch.object(NyxAPI, "PALETTE_LAYOUT_FILE", palette_path), \
+                 patch("NyxAPI._write_atomic", wraps=NyxAPI._write_atomic) as mock_write:
+                for i in range(5):
+                    layout = {"categories": {"Other": [f"emoji{i}"]}, "hidden": [], "use_counts": {}}
+                    resp = await self.client.post("/api/palette", data=orjson.dumps(layout), headers=self.headers)
+                    self.assertEqual(resp.status, 200)
+
+                # Unflushed save is still served by GET
+                resp = await self.client.get("/api/palette", headers=self.headers)
+                self.assertEqual(orjson.loads(await resp.read())["categories"]["Other"], ["emoji4"])
+
+                await asyncio.sleep(NyxAPI.SAVE_DEBOUNCE_SECONDS * 3)
+                mock_write.assert_called_once()
+                with open(palette_path) as f:
+                    raw = f.read()
+                self.assertEqual(json.loads(raw)["categories"]["Other"], ["emoji4"])
+                self.assertTrue(raw.startswith('{\n  "categories"'))
+                self.assertTrue(raw.endswith("}\n"))
+                self.assertEqual(os.listdir(tmp), ["palette_layout.json"]) # No temp file left behind
+
+    async def test_presets_served_from_memory(self):
+        import tempfile, json
+        with tempfile.TemporaryDirectory() as tmp:
+            presets_path = os.path.join(tmp, "presets.json")
+            with open(presets_path, "w") as f:
+                json.dump({"Morning": "<:Sun:1> Good morning"}, f)
+
+            with patch.object(NyxAPI, "PRESETS_FILE", presets_path), \
+                 patch("NyxAPI._read_bytes", wraps=NyxAPI._read_bytes) as mock_read:
+                for _ in range(3):
+                    resp = await self.client.get("/api/presets", headers=self.headers)
+                    self.assertEqual(orjson.loads(await resp.read()), {"Morning": "<:Sun:1> Good morning"})
+                mock_read.assert_called_once()
+
+    async def test_missing_presets_returns_empty(self):
+        with patch.object(NyxAPI, "PRESETS_FILE", "/nonexistent/presets.json"):
+            resp = await self.client.get("/api/presets", headers=self.headers)
+            self.assertEqual(orjson.loads(await resp.read()), {})
+
+    async def test_bars_msgpack_negotiation(self):
+        import msgpack
+        channel = MagicMock()
+        channel.name = "general"
+        channel.category = None
+        self.bot.get_channel.return_value = channel
+        self.bot.active_bars = {123: {"message_id": 456, "content": "hi"}}
+
+        with patch("NyxAPI.memory_manager.get_master_bar", return_value="hi"):
+            resp = await self.client.get("/api/bars", headers={**self.headers, "Accept": "application/msgpack"})
+            self.assertEqual(resp.content_type, "application/msgpack")
+            data = msgpack.unpackb(await resp.read(), raw=False)
+            self.assertEqual(data["bars"][0]["channel_name"], "general")
+
+            # Browsers still get JSON
+            resp = await self.client.get("/api/bars", headers=self.headers)
+            self.assertEqual(resp.content_type, "application/json")
+            self.assertEqual(orjson.loads(await resp.read())["count"], 1)
+
+    async def test_bars_cache_rebuilt_on_change(self):
+        channel = MagicMock()
+        channel.name = "general"
+        channel.category = None
+        self.bot.get_channel.return_value = channel
+        self.bot.active_bars = {123: {"message_id": 456, "content": "hi"}}
+
+        with patch("NyxAPI.memory_manager.get_master_bar", return_value="hi"):
+            bars, _ = await self.api._collect_bars()
+            self.assertEqual(bars[0]["message_id"], "456")
+
+            # Unchanged bars -> no channel lookups
+            self.bot.get_channel.reset_mock()
+            await self.api._collect_bars()
+            self.bot.get_channel.assert_not_called()
+
+            # Bar dropped (new message id) -> rebuilt
+            self.bot.active_bars[123]["message_id"] = 789
+            bars, _ = await self.api._collect_bars()
+            self.assertEqual(bars[0]["message_id"], "789")
+
+            # Adding a bar only looks up the new channel
+            self.bot.get_channel.reset_mock()
+            self.bot.active_bars[321] = {"message_id": 654}
+            bars, _ = await self.api._collect_bars()
+            self.assertEqual([b["channel_id"] for b in bars], ["123", "321"])
+            self.bot.get_channel.assert_called_once_with(321)
+
+            # Channel renamed -> invalidated by the bot
+            channel.name = "renamed"
+            self.api.invalidate_bars_cache()
+            bars, _ = await self.api._collect_bars()
+            self.assertEqual([b["channel_name"] for b in bars], ["renamed", "renamed"])
+
+    async def test_bars_cache_retries_unresolved_channels(self):
+        channel = MagicMock()
+        channel.name = "general"
+        channel.category = None
+        self.bot.get_channel.side_effect = lambda cid: channel if cid == 123 else None
+        self.bot.active_bars = {123: {"message_id": 456}, 321: {"message_id": 654}}
+
+        with patch("NyxAPI.memory_manager.get_master_bar", return_value="hi"):
+            bars, _ = await self.api._collect_bars()
+            self.assertEqual([b["channel_id"] for b in bars], ["123"])
+
+            # The missing channel resolves later -> picked up without the bar set changing
+            self.bot.get_channel.side_effect = lambda cid: channel
+            self.bot.get_channel.reset_mock()
+            bars, _ = await self.api._collect_bars()
+            self.assertEqual([b["channel_id"] for b in bars], ["123", "321"])
+            self.bot.get_channel.assert_called_once_with(321)
+
+    async def test_large_responses_are_gzipped(self):
+        self.temple_guild.emojis = [self._make_emoji(f"Emoji{i}", i) for i in range(50)]
+
+        with patch.object(NyxAPI, "EMOJI_DB_FILE", "/nonexistent/emoji_db.json"):
+            resp = await self.client.get("/api/emojis", headers={**self.headers, "Accept-Encoding": "gzip"})
+            self.assertEqual(resp.headers.get("Content-Encoding"), "gzip")
+            self.assertEqual(orjson.loads(await resp.read())["count"], 50)
+
+        # Small responses stay uncompressed
+        resp = await self.client.get("/api/status", headers={**self.headers, "Accept-Encoding": "gzip"})
+        self.assertIsNone(resp.headers.get("Content-Encoding"))
+
+    async def test_emojis_ndjson_stream(self):
+        self.temple_guild.emojis = [self._make_emoji("Nyx", 1), self._make_emoji("Calyptra", 2)]
+
+        with patch.object(NyxAPI, "EMOJI_DB_FILE", "/nonexistent/emoji_db.json"):
+            resp = await self.client.get("/api/emojis", headers={**self.headers, "Accept": "application/x-ndjson"})
+            self.assertEqual(resp.content_type, "application/x-ndjson")
+            self.assertEqual(resp.headers["Access-Control-Allow-Origin"], "*")
+            lines = (await resp.read()).splitlines()
+
+        self.assertEqual([orjson.loads(line)["name"] for line in lines], ["Nyx", "Calyptra"])
+
+    async def test_emoji_fragments_memoized_per_id(self):
+        emoji = self._make_emoji("Nyx", 1)
+        self.temple_guild.emojis = [emoji]
+
+        with patch.object(NyxAPI, "EMOJI_DB_FILE", "/nonexistent/emoji_db.json"):
+            frags = [f async for f in self.api._iter_emoji_fragments()]
+            self.assertIs(frags[0], self.api._emoji_fragments[1])
+
+            # Memoized fragment is reused, even if the live object changed
+            emoji.name = "NyxRenamed"
+            frags = [f async for f in self.api._iter_emoji_fragments()]
+            self.assertEqual(orjson.loads(frags[0])["name"], "Nyx")
+
+            # Discord emoji update clears the memo
+            self.api.invalidate_emoji_cache()
+            frags = [f async for f in self.api._iter_emoji_fragments()]
+            self.assertEqual(orjson.loads(frags[0])["string"], "<:NyxRenamed:1>")
+
+    async def test_sync_emojis_adds_missing_once(self):
+        import tempfile, json
+        self.temple_guild.emojis = [self._make_emoji("Nyx", 1), self._make_emoji("Star", 2)]
+        with tempfile.TemporaryDirectory() as tmp:
+            palette_path = os.path.join(tmp, "palette_layout.json")
+            db_path = os.path.join(tmp, "emoji_db.json")
+            with open(palette_path, "w") as f:
+                json.dump({"categories": {"Other": ["Nyx"]}, "hidden": [], "use_counts": {}}, f)
+            with open(db_path, "w") as f:
+                json.dump({"Star": "<:Star:2>", "Moon": "<:Moon:4>"}, f)
+
+            with patch.object(NyxAPI, "PALETTE_LAYOUT_FILE", palette_path), patch.object(NyxAPI, "EMOJI_DB_FILE", db_path):
+                resp = await self.client.post("/api/emojis/sync", headers=self.headers)
+                self.assertEqual(orjson.loads(await resp.read()), {"status": "success", "added": 2})
+
+                resp = await self.client.get("/api/palette", headers=self.headers)
+                self.assertEqual(orjson.loads(await resp.read())["hidden"], ["Star", "Moon"])
+
+    async def test_no_temple_guild_means_no_discord_emojis(self):
+        self.bot.get_guild.side_effect = None
+        self.bot.get_guild.return_value = None
+        with patch.object(NyxAPI, "EMOJI_DB_FILE", "/nonexistent/emoji_db.json"):
+            resp = await self.client.get("/api/emojis", headers=self.headers)
+            self.assertEqual(orjson.loads(await resp.read()), {"emojis": [], "count": 0})
+
+    async def test_unauthorized(self):
+        resp = await self.client.get("/api/status", headers={"x-api-key": "wrong"})
+        self.assertEqual(resp.status, 401)
+        self.assertEqual(orjson.loads(await resp.read()), {"error": "Unauthorized"})
+
+    async def test_options_preflight_skips_auth(self):
+        resp = await self.client.options("/api/status")
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(resp.headers["Access-Control-Allow-Origin"], "*")
+
+    async def test_cors_headers_on_success(self):
+        resp = await self.client.get("/api/status", headers=self.headers)
+        self.assertEqual(resp.headers["Access-Control-Allow-Methods"], "*")
+        self.assertEqual(resp.headers["Access-Control-Allow-Headers"], "*")
+
+    async def test_global_state_parses_raw_body(self):
+        async def sleep_all_bars():
+            pass
+        self.api._state_actions["sleep"] = MagicMock(side_effect=sleep_all_bars)
+
+        resp = await self.client.post("/api/global/state", data=orjson.dumps({"action": "sleep"}), headers=self.headers)
+        self.assertEqual(resp.status, 200)
+        self.assertEqual(orjson.loads(await resp.read()), {"status": "success", "action": "sleep"})
+        self.api._state_actions["sleep"].assert_called_once()
+
+    async def test_global_state_invalid_action(self):
+        resp = await self.client.post("/api/global/state", data=orjson.dumps({"action": "dance"}), headers=self.headers)
+        self.assertEqual(resp.status, 400)
+
+class TestBarsCacheInvalidation(unittest.IsolatedAsyncioTestCase):
+
+    async def test_category_rename_invalidates_bars(self):
+        import discord
+        import NyxOS
+
+        bot = NyxOS.LMStudioBot()
+        bot.api_server = MagicMock()
+        bot.active_bars = {123: {"message_id": 456}}
+        bar_channel = MagicMock()
+        bar_channel.category_id = 50
+        category = MagicMock(spec=discord.CategoryChannel)
+
+        with patch.object(bot, "get_channel", return_value=bar_channel):
+            # Unrelated category -> cache kept
+            category.id = 60
+            await bot.on_guild_channel_update(category, category)
+            bot.api_server.invalidate_bars_cache.assert_not_called()
+
+            # The bar's own category -> its cached name is stale
+            category.id = 50
+            await bot.on_guild_channel_update(category, category)
+            bot.api_server.invalidate_bars_cache.assert_called_once()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -19,6 +19,7 @@ class TestProxyReaction(unittest.IsolatedAsyncioTestCase):
         mock_client.processing_locks = set()
         mock_client.volition = MagicMock()
         mock_client.volition.update_buffer = AsyncMock()
+        mock_client.history_cache.remember = MagicMock()
         mock_client.abort_signals = set()
         
         # Emotional Core (Sync)
@@ -56,6 +57,7 @@ class TestProxyReaction(unittest.IsolatedAsyncioTestCase):
         mock_client.active_bars = {} # Not persisting
         mock_client.volition = MagicMock()
         mock_client.volition.update_buffer = AsyncMock()
+        mock_client.history_cache.remember = MagicMock()
         mock_client.abort_signals = set()
         
         # Emotional Core (Sync)
@@ -95,6 +97,7 @@ class TestProxyReaction(unittest.IsolatedAsyncioTestCase):
         mock_client.processing_locks = set()
         mock_client.volition = MagicMock()
         mock_client.volition.update_buffer = AsyncMock()
+        mock_client.history_cache.remember = MagicMock()
         mock_client.abort_signals = set()
         
         # Emotional Core (Sync)
@@ -31,6 +31,7 @@ class TestSeraphWebhook(unittest.IsolatedAsyncioTestCase):
         # Volition
         mock_client.volition = MagicMock()
         mock_client.volition.update_buffer = AsyncMock()
+        mock_client.history_cache.remember = MagicMock()
         
         # Emotional Core (Sync)
         mock_client.emotional_core = MagicMock()
@@ -99,6 +100,7 @@ class TestSeraphWebhook(unittest.IsolatedAsyncioTestCase):
         
         mock_client.volition = MagicMock()
         mock_client.volition.update_buffer = AsyncMock()
+        mock_client.history_cache.remember = MagicMock()
         
         # Emotional Core (Sync)
         mock_client.emotional_core = MagicMock()
@@ -4,6 +4,7 @@ import services
 import config
 from datetime import datetime
 import json
+import asyncio
 
 class TestServices:
     
@@ -42,6 +43,108 @@ class TestServices:
         assert result2['system_id'] == 'sys1'
         assert api_service.http_session.get.call_count == 1  # Count should NOT increment
 
+    @pytest.mark.asyncio
+    async def test_pluralkit_cache_expires(self, api_service):
+        user_id = "12345"
+        mock_resp = AsyncMock()
+        mock_resp.status = 200
+        mock_resp.json.return_value = {'id': 'sys1', 'tag': 'Tag'}
+        mock_get_ctx = AsyncMock()
+        mock_get_ctx.__aenter__.return_value = mock_resp
+        api_service.http_session.get.return_value = mock_get_ctx
+
+        with patch('services.time.monotonic', return_value=1000.0):
+            await api_service.get_pk_user_data(user_id)
+        # Still fresh just before the TTL, refetched once it has passed
+        with patch('services.time.monotonic', return_value=1000.0 + api_service.PK_CACHE_TTL - 1):
+            await api_service.get_pk_user_data(user_id)
+        assert api_service.http_session.get.call_count == 1
+        with patch('services.time.monotonic', return_value=1000.0 + api_service.PK_CACHE_TTL + 1):
+            await api_service.get_pk_user_data(user_id)
+        assert api_service.http_session.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_pluralkit_concurrent_lookups_coalesced(self, api_service):
+        mock_resp = AsyncMock()
+        mock_resp.status = 200
+        mock_resp.json.return_value = {'id': 'sys1', 'tag': 'Tag'}
+
+        async def slow_enter(*args):
+            await asyncio.sleep(0.01)
+            return mock_resp
+
+        mock_get_ctx = AsyncMock()
+        mock_get_ctx.__aenter__.side_effect = slow_enter
+        api_service.http_session.get.return_value = mock_get_ctx
+
+        results = await asyncio.gather(*(api_service.get_pk_user_data("12345") for _ in range(5)))
+        assert all(r['system_id'] == 'sys1' for r in results)
+        assert api_service.http_session.get.call_count == 1
+        assert api_service.pk_inflight == {}
+
+    @pytest.mark.asyncio
+    async def test_pluralkit_error_cached_briefly(self, api_service):
+        mock_resp = AsyncMock()
+        mock_resp.status = 503
+        mock_get_ctx = AsyncMock()
+        mock_get_ctx.__aenter__.return_value = mock_resp
+        api_service.http_session.get.return_value = mock_get_ctx
+
+        with patch('services.config.USE_LOCAL_PLURALKIT', False):
+            with patch('services.time.monotonic', return_value=1000.0):
+                assert await api_service.get_pk_user_data("12345") is None
+                assert await api_service.get_pk_user_data("12345") is None
+            assert api_service.http_session.get.call_count == 1
+            # An error expires long before a real "not found" would
+            with patch('services.time.monotonic', return_value=1000.0 + api_service.PK_ERROR_TTL + 1):
+                await api_service.get_pk_user_data("12345")
+            assert api_service.http_session.get.call_count == 2
+
+    def test_expiring_lru_evicts_oldest(self):
+        cache = services.ExpiringLRU(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", None)
+        assert cache.get("a") == 1 # Touch "a" so "b" is now the oldest
+        cache.set("c", 3)
+        assert "b" not in cache
+        assert "a" in cache and "c" in cache
+
+    @pytest.mark.asyncio
+    async def test_search_kagi_many_concurrent(self, api_service):
+        in_flight = 0
+        peak = 0
+
+        def fake_get(url, params=None, **kwargs):
+            query = params["q"]
+            resp = AsyncMock()
+            resp.status = 200
+            resp.json.return_value = {"data": [{"title": query, "snippet": "s", "url": "u"}]}
+
+            async def enter():
+                nonlocal in_flight, peak
+                in_flight += 1
+                peak = max(peak, in_flight)
+                await asyncio.sleep(0.01)
+                return resp
+
+            async def exit_(*args):
+                nonlocal in_flight
+                in_flight -= 1
+
+            ctx = MagicMock()
+            ctx.__aenter__ = lambda *a: enter()
+            ctx.__aexit__ = exit_
+            return ctx
+
+        api_service.http_session.get.side_effect = fake_get
+        queries = ["q1", "q2", "q3", "q4", "q5"]
+        with patch('services.config.KAGI_API_TOKEN', "dummy_token"):
+            results = await api_service.search_kagi_many(queries)
+
+        # Results line up with their queries; requests overlap but never exceed the semaphore
+        assert [f"[{q}]" in r for q, r in zip(queries, results)] == [True] * 5
+        assert peak == 3
+
     @pytest.mark.asyncio
     async def test_generate_search_queries(self, api_service):
         user_prompt = "What is the weather? &web"
@@ -199,3 +302,67 @@ class TestServices:
             assert response == "Text Response"
             # Verify logic called twice
             assert api_service.http_session.post.call_count == 2
+
+            # The retry carries plain-text content with the image replaced by a note
+            retry_messages = api_service.http_session.post.call_args[1]['json']['messages']
+            assert retry_messages[-1]['content'] == "User says: Prompt (Image Download Failed)"
+
+    @pytest.mark.asyncio
+    async def test_send_payload_sanitizes_only_bracketed_messages(self, api_service):
+        mock_resp = AsyncMock()
+        mock_resp.status = 200
+        mock_resp.json.return_value = {"choices": [{"message": {"content": "ok"}}]}
+        mock_post_ctx = AsyncMock()
+        mock_post_ctx.__aenter__.return_value = mock_resp
+        api_service.http_session.post.return_value = mock_post_ctx
+
+        clean = {"role": "system", "content": "No brackets here"}
+        bracketed = {"role": "user", "content": [{"type": "text", "text": "see [link]"}, {"type": "image_url", "image_url": {"url": "u"}}]}
+        await api_service._send_payload([clean, bracketed])
+
+        sent = api_service.http_session.post.call_args[1]['json']['messages']
+        assert sent[0] is clean # Nothing to rewrite, so no copy
+        assert sent[1]['content'][0]['text'] == "see (link)"
+        assert bracketed['content'][0]['text'] == "see [link]" # Caller's message untouched
+
+    @pytest.mark.asyncio
+    async def test_query_lm_studio_history_cleanup(self, api_service):
+        mock_resp = AsyncMock()
+        mock_resp.status = 200
+        mock_resp.json.return_value = {"choices": [{"message": {"content": "ok"}}]}
+        mock_post_ctx = AsyncMock()
+        mock_post_ctx.__aenter__.return_value = mock_resp
+        api_service.http_session.post.return_value = mock_post_ctx
+        history = [
+            {'role': 'user', 'content': "# I'm back online! Hi!"},
+            {'role': 'assistant', 'content': 'Leading reply'},
+            {'role': 'user', 'content': [{'type': 'text', 'text': 'Question'}]},
+            {'role': 'assistant', 'content': 'Answer'},
+        ]
+
+        with patch('services.memory_manager.write_context_buffer', AsyncMock()):
+            await api_service.query_lm_studio("Next", "User", "", history, MagicMock(), system_prompt_override="Sys")
+
+        # Startup announcement dropped, then the assistant turn it left at the front
+        sent = api_service.http_session.post.call_args[1]['json']['messages']
+        assert [m['role'] for m in sent] == ['system', 'user', 'assistant', 'user']
+        assert sent[1]['content'] == [{'type': 'text', 'text': 'Question'}]
+
+    @pytest.mark.asyncio
+    async def test_query_lm_studio_fills_placeholders(self, api_service):
+        mock_resp = AsyncMock()
+        mock_resp.status = 200
+        mock_resp.json.return_value = {"choices": [{"message": {"content": "ok"}}]}
+        mock_post_ctx = AsyncMock()
+        mock_post_ctx.__aenter__.return_value = mock_resp
+        api_service.http_session.post.return_value = mock_post_ctx
+
+        with patch('services.memory_manager.write_context_buffer', AsyncMock()), \
+             patch('services.helpers.get_system_time', return_value=("Monday, January 1, 2024", "12:00 PM")), \
+             patch('config.SYSTEM_PROMPT', "Talk to {{USER_NAME}} for {{Seraphim}}.{{CONTEXT}} Now: {{CURRENT_DATETIME}} {keep}"), \
+             patch('config.INJECTED_PROMPT', ""):
+            await api_service.query_lm_studio("Hi", "User", "", [], MagicMock())
+
+        sys_msg = api_service.http_session.post.call_args[1]['json']['messages'][0]['content']
+        # Literal braces in the prompt survive; no date header since the placeholder was used
+        assert sys_msg.startswith("Talk to the people in this chatroom for Seraphim. Now: Monday, January 1, 2024, 12:00 PM {keep}")
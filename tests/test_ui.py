@@ -37,6 +37,20 @@ class TestUI:
             assert "🔄 Reboot" in labels
             assert "🛑 Shutdown" in labels
 
+    def test_find_button(self):
+        with patch('memory_manager.get_server_setting', return_value=True), \
+             patch('asyncio.get_running_loop'):
+            view = ui.ResponseView()
+        # Indexed lookup covers decorator buttons and debug buttons added in __init__
+        assert ui.find_button(view, "good_bot_btn") is next(c for c in view.children if c.custom_id == "good_bot_btn")
+        assert ui.find_button(view, "debug_reboot_btn").label == "🔄 Reboot"
+        assert ui.find_button(view, "missing_btn") is None
+
+        # Views without the index fall back to scanning children
+        other = MagicMock(spec=["children"])
+        other.children = [MagicMock(custom_id="bug_report_btn")]
+        assert ui.find_button(other, "bug_report_btn") is other.children[0]
+
     @pytest.mark.asyncio
     async def test_retry_button(self, mock_interaction):
         with patch('asyncio.get_running_loop'):
@@ -97,6 +97,19 @@ BAR_PREFIX_EMOJIS = [
 ANGEL_CONTENT = "<a:SacredMagicStrong:1316971256830103583><a:SeraphWingLeft:1297050718754312192><a:SacredEyeLuminara:1296698905744113715><a:SeraphWingRight:1297051921651073055><a:SacredMagicStrong:1316971256830103583> \n<a:HyperRingPresence:1303962112317587466><a:HyperRingPresence:1303962112317587466><a:SacredWind:1296975869566259396><a:HyperRingPresence:1303962112317587466><a:HyperRingPresence:1303962112317587466>"
 DARK_ANGEL_CONTENT = "<a:SacredMagicStrong:1316971256830103583><a:SeraphWingLeft:1297050718754312192><a:SacredEyeYami:1418478480336879716><a:SeraphWingRight:1297051921651073055><a:SacredMagicStrong:1316971256830103583> \n<a:HyperRingPresence:1303962112317587466><a:HyperRingPresence:1303962112317587466><a:SacredWind:1296975869566259396><a:HyperRingPresence:1303962112317587466><a:HyperRingPresence:1303962112317587466>"
 
+def find_button(view, custom_id):
+    """A view's button by custom_id; ResponseViews answer from their index, other views are scanned."""
+    index = getattr(view, "buttons_by_id", None)
+    if index is not None: return index.get(custom_id)
+    return discord.utils.get(view.children, custom_id=custom_id)
+
+def format_good_bot_chart(limit=10):
+    """Leaderboard text for /goodbot and &goodbot, or None if nobody has a Good Bot yet."""
+    top, total = memory_manager.get_good_bot_top(limit)
+    if not top: return None
+    rows = "".join(f"**{i}.** {user_data['username']} — **{user_data['count']}**\n" for i, user_data in enumerate(top, 1))
+    return f"{FLAVOR_TEXT['GOOD_BOT_HEADER']}{rows}\n**Total:** {total} Good Bots 💙"
+
 # ==========================================
 # BUG REPORT MODAL & VIEW
 # ==========================================
@@ -149,13 +162,10 @@ class BugReportModal(discord.ui.Modal, title="Report a Bug"):
                     
                     if self.original_message_id in interaction.client.active_views:
                         view = interaction.client.active_views[self.original_message_id]
-                        updated = False
-                        for child in view.children:
-                            if getattr(child, "custom_id", "") == "bug_report_btn":
-                                child.label = "Thanks!"
-                                child.disabled = True
-                                updated = True
-                        if updated:
+                        child = find_button(view, "bug_report_btn")
+                        if child:
+                            child.label = "Thanks!"
+                            child.disabled = True
                             await origin_msg.edit(view=view)
                 except Exception as e:
                     logger.error(f"Failed to update bug report button: {e}")
@@ -463,6 +473,9 @@ class ResponseView(discord.ui.View):
         if memory_manager.get_server_setting("debug_mode", False):
             self.add_debug_buttons()
 
+        # custom_id -> button, for updates from outside the view (good bot, bug report, next reply)
+        self.buttons_by_id = {c.custom_id: c for c in self.children if getattr(c, "custom_id", None)}
+
     def add_debug_buttons(self):
         # Reboot
         btn_reboot = discord.ui.Button(label="🔄 Reboot", style=discord.ButtonStyle.danger, row=1, custom_id="debug_reboot_btn")
@@ -585,7 +598,7 @@ class ResponseView(discord.ui.View):
         now = datetime.now().timestamp()
         last_time = getattr(interaction.client, "good_bot_cooldowns", {}).get(interaction.user.id, 0)
         
-        if now - last_time < 5:
+        if now - last_time < config.GOOD_BOT_COOLDOWN_SECONDS:
             await interaction.response.send_message(FLAVOR_TEXT["GOOD_BOT_COOLDOWN"], ephemeral=True)
             return
             